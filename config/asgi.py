@@ -9,6 +9,7 @@ django_asgi_app = get_asgi_application()
 from channels.routing import ProtocolTypeRouter, URLRouter
 
 import voice.routing
+from voice.lifespan import VoiceLifespanApp
 from voice.token_auth import TokenAuthMiddleware
 
 
@@ -18,5 +19,6 @@ application = ProtocolTypeRouter(
         "websocket": TokenAuthMiddleware(
             URLRouter(voice.routing.websocket_urlpatterns)
         ),
+        "lifespan": VoiceLifespanApp(),
     }
 )
@@ -187,6 +187,23 @@ if CHANNEL_BACKEND == "redis":
 else:
     CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
 
+# ----------------------------
+# Cache (compiled persona prompts)
+# ----------------------------
+# locmem is per worker process. To share compiled prompts across workers:
+# CACHE_BACKEND=redis and CACHE_REDIS_URL=redis://host:6379/1 (needs `pip install redis`)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem").lower()
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_REDIS_URL", "") or os.getenv("REDIS_URL", ""),
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 # ----------------------------
 # Database
 # ----------------------------
@@ -270,6 +287,12 @@ VOICE_APP = {
     # Chroma persistence location (only used if VECTOR_DB=chroma)
     "CHROMA_DIR": os.getenv("CHROMA_DIR", str(BASE_DIR / "chroma_db")),
 
+    # RAG embedder: "sentence_transformers" (PyTorch) or "onnx" (ONNX Runtime, same vectors)
+    "EMBEDDER": os.getenv("EMBEDDER", "sentence_transformers"),
+    "ONNX_EMBEDDER_DIR": os.getenv("ONNX_EMBEDDER_DIR", str(BASE_DIR / "models" / "minilm-onnx")),
+    "ONNX_EMBEDDER_QUANTIZED": os.getenv("ONNX_EMBEDDER_QUANTIZED", "0") == "1",
+    "ONNX_EMBEDDER_THREADS": int(os.getenv("ONNX_EMBEDDER_THREADS", "1")),
+
     # API keys
     "GROQ_API_KEY": os.getenv("GROQ_API_KEY", ""),
     "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", ""),
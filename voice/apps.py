@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class VoiceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "voice"
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connects LovedOne -> prompt cache invalidation)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import struct
+from typing import List, Optional
+
+import av
+import numpy as np
+from av.audio.codeccontext import AudioCodecContext
+
+
+OPUS_FRAME_MS = (20, 40, 60)
+
+
+class OpusStreamEncoder:
+    """
+    Streaming PCM16LE mono -> Opus packet encoder (libopus via PyAV).
+
+    PCM arrives in arbitrary-sized TTS frames; samples are buffered until a whole
+    Opus frame (`frame_ms`) is available, so every returned packet is exactly one frame.
+    One encoder per reply generation: `flush()` at the end of a reply, `reset()` on
+    interrupt to drop whatever is still buffered.
+    """
+
+    def __init__(self, *, sample_rate: int = 24000, frame_ms: int = 20, bitrate: int = 32000):
+        if frame_ms not in OPUS_FRAME_MS:
+            frame_ms = 20
+        self.sample_rate = int(sample_rate)
+        self.frame_ms = int(frame_ms)
+        self.bitrate = int(bitrate)
+
+        self._pending = bytearray()
+        self._pts = 0
+        self._ctx = self._open()
+
+    def _open(self) -> AudioCodecContext:
+        ctx = av.CodecContext.create("libopus", "w")
+        ctx.sample_rate = self.sample_rate
+        ctx.layout = "mono"
+        ctx.format = "s16"
+        ctx.bit_rate = self.bitrate
+        ctx.options = {"frame_duration": str(self.frame_ms), "application": "voip"}
+        ctx.open()
+        self._frame_bytes = int(ctx.frame_size or (self.sample_rate * self.frame_ms // 1000)) * 2
+        self._pending.clear()
+        self._pts = 0
+        return ctx
+
+    def _encode_frame(self, pcm: bytes | memoryview) -> List[bytes]:
+        samples = np.frombuffer(pcm, dtype="<i2").reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+        frame.sample_rate = self.sample_rate
+        frame.pts = self._pts
+        self._pts += samples.shape[1]
+        return [bytes(p) for p in self._ctx.encode(frame)]
+
+    def encode(self, pcm: bytes | memoryview) -> List[bytes]:
+        """Feed PCM16LE; returns zero or more complete Opus packets."""
+        if not pcm:
+            return []
+        self._pending.extend(pcm)
+        out: List[bytes] = []
+        fb = self._frame_bytes
+        whole = len(self._pending) - (len(self._pending) % fb)
+        if whole:
+            view = memoryview(self._pending)
+            try:
+                for i in range(0, whole, fb):
+                    out.extend(self._encode_frame(view[i : i + fb]))
+            finally:
+                view.release()
+            del self._pending[:whole]
+        return out
+
+    def flush(self) -> List[bytes]:
+        """End of reply: pad the tail with silence, drain the encoder, start fresh."""
+        out: List[bytes] = []
+        if self._pending:
+            self._pending.extend(b"\x00" * (self._frame_bytes - len(self._pending)))
+            out.extend(self._encode_frame(bytes(self._pending)))
+            self._pending.clear()
+        out.extend(bytes(p) for p in self._ctx.encode(None))
+        self._ctx = self._open()
+        return out
+
+    def reset(self):
+        """Interrupt: drop buffered samples + encoder state without emitting anything."""
+        self._ctx = self._open()
+
+    @property
+    def buffered_ms(self) -> float:
+        return len(self._pending) / 2 * 1000.0 / self.sample_rate
+
+    @property
+    def pre_skip(self) -> int:
+        """Encoder lookahead in 48 kHz samples, from the OpusHead libopus writes (RFC 7845)."""
+        head = bytes(self._ctx.extradata or b"")
+        if len(head) >= 12 and head[:8] == b"OpusHead":
+            return struct.unpack_from("<H", head, 10)[0]
+        return 312  # libopus default
+
+
+class OpusStreamDecoder:
+    """
+    Streaming Opus packet -> PCM16LE mono decoder for mic uplink (libopus via PyAV).
+
+    libopus always decodes at 48 kHz here; the output is resampled incrementally to
+    `sample_rate` so callers get the same PCM16 the raw-PCM path produces.
+    One packet per call (one websocket message = one Opus packet).
+    """
+
+    DECODE_RATE = 48000
+
+    def __init__(self, *, sample_rate: int = 24000):
+        from .audio_dsp import StreamResampler
+
+        self.sample_rate = int(sample_rate)
+        self._resampler = StreamResampler(self.DECODE_RATE, self.sample_rate)
+        self._ctx = self._open()
+
+    def _open(self) -> AudioCodecContext:
+        ctx = av.CodecContext.create("libopus", "r")
+        ctx.sample_rate = self.DECODE_RATE
+        ctx.layout = "mono"
+        ctx.open()
+        return ctx
+
+    def decode(self, packet: bytes) -> bytes:
+        if not packet:
+            return b""
+        parts: List[bytes] = []
+        for frame in self._ctx.decode(av.Packet(packet)):
+            samples = frame.to_ndarray().reshape(-1)  # mono: (1, n) in both s16 and flt layouts
+            if samples.dtype != np.int16:
+                samples = np.clip(np.rint(samples * 32767.0), -32768, 32767)
+            parts.append(samples.astype("<i2").tobytes())
+        return self._resampler.process(b"".join(parts))
+
+    def flush(self) -> bytes:
+        """End of stream: the resampler's last few samples."""
+        return self._resampler.flush()
+
+    def reset(self):
+        self._ctx = self._open()
+        self._resampler.reset()
+
+
+# Opus "blob": a whole PCM16 clip as one compact byte string (TTS cache disk tier).
+#   header: 4s magic, u32 sample rate, u32 sample count, u16 pre-skip (48 kHz samples);
+#   then per packet: u16 length + packet
+_OPUS_BLOB_MAGIC = b"OPB2"
+_OPUS_BLOB_HEADER = struct.Struct("<4sIIH")
+_OPUS_BLOB_LEN = struct.Struct("<H")
+
+
+def encode_opus_blob(pcm: bytes, *, sample_rate: int = 24000, frame_ms: int = 20, bitrate: int = 48000) -> bytes:
+    """PCM16LE mono clip -> Opus blob (decode with decode_opus_blob)."""
+    enc = OpusStreamEncoder(sample_rate=sample_rate, frame_ms=frame_ms, bitrate=bitrate)
+    packets = enc.encode(pcm) + enc.flush()
+    parts = [_OPUS_BLOB_HEADER.pack(_OPUS_BLOB_MAGIC, enc.sample_rate, len(pcm) // 2, enc.pre_skip)]
+    for pkt in packets:
+        parts.append(_OPUS_BLOB_LEN.pack(len(pkt)))
+        parts.append(pkt)
+    return b"".join(parts)
+
+
+def decode_opus_blob(blob: bytes) -> Optional[bytes]:
+    """Opus blob -> PCM16LE with the original sample count; None if the blob is malformed."""
+    if len(blob) < _OPUS_BLOB_HEADER.size:
+        return None
+    magic, rate, n_samples, pre_skip = _OPUS_BLOB_HEADER.unpack_from(blob, 0)
+    if magic != _OPUS_BLOB_MAGIC or rate <= 0:
+        return None
+
+    dec = OpusStreamDecoder(sample_rate=rate)
+    parts: List[bytes] = []
+    pos = _OPUS_BLOB_HEADER.size
+    while pos < len(blob):
+        if pos + _OPUS_BLOB_LEN.size > len(blob):
+            return None
+        (n,) = _OPUS_BLOB_LEN.unpack_from(blob, pos)
+        pos += _OPUS_BLOB_LEN.size
+        if pos + n > len(blob):
+            return None
+        parts.append(dec.decode(blob[pos : pos + n]))
+        pos += n
+    parts.append(dec.flush())
+
+    skip = 2 * (pre_skip * rate // 48000)  # the decoder's resampler adds no delay of its own
+    pcm = b"".join(parts)[skip : skip + 2 * n_samples]
+    return pcm + bytes(2 * n_samples - len(pcm))
@@ -0,0 +1,208 @@
+"""
+PCM16 mono helpers (NumPy). Everything takes / returns little-endian PCM16 bytes;
+a trailing odd byte is ignored by the analysis functions.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import gcd
+from typing import Iterator
+
+import numpy as np
+
+
+def _i16(pcm: bytes) -> np.ndarray:
+    """Zero-copy int16 view of PCM16LE bytes (trailing odd byte dropped)."""
+    return np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+
+
+def pcm16_rms(pcm: bytes) -> float:
+    """RMS in raw sample units (0..32768), same scale as audioop.rms(pcm, 2)."""
+    x = _i16(pcm)
+    if x.size == 0:
+        return 0.0
+    xf = x.astype(np.float32)
+    return float(np.sqrt(np.dot(xf, xf) / x.size))
+
+
+def pcm16_peak(pcm: bytes) -> int:
+    x = _i16(pcm)
+    if x.size == 0:
+        return 0
+    return int(max(-int(x.min()), int(x.max())))
+
+
+def pcm16_dbfs(pcm: bytes) -> float:
+    """Frame energy in dBFS (full-scale sine ~ -3 dBFS, digital silence -> -120)."""
+    x = _i16(pcm)
+    if x.size == 0:
+        return -120.0
+    xf = x.astype(np.float32)
+    ms = float(np.dot(xf, xf)) / x.size
+    return float(10.0 * np.log10(ms / (32768.0 * 32768.0) + 1e-12))
+
+
+def pcm16_stats(pcm: bytes, *, max_points: int = 4000) -> dict:
+    """Debug stats (min / max / rms) over at most `max_points` evenly strided samples."""
+    if not pcm:
+        return {"n": 0}
+    x = _i16(pcm)
+    n = int(x.size)
+    if n <= 0:
+        return {"n": 0, "note": "odd_len"}
+    step = max(1, n // max(1, int(max_points)))
+    xs = x[::step].astype(np.float32)
+    rms = float(np.sqrt(np.dot(xs, xs) / xs.size))
+    return {"n": n, "min": int(xs.min()), "max": int(xs.max()), "rms": round(rms, 2), "bytes": len(pcm), "step": step}
+
+
+def swap_endian16(pcm: bytes | memoryview) -> bytes:
+    """Byte-swap every 16-bit sample (BE <-> LE); a trailing odd byte is kept as-is."""
+    if len(pcm) < 2:
+        return bytes(pcm)
+    even = len(pcm) & ~1
+    out = np.frombuffer(pcm, dtype=np.uint16, count=even // 2).byteswap().tobytes()
+    return out + pcm[even:] if even != len(pcm) else out
+
+
+def apply_gain(pcm: bytes, gain: float) -> bytes:
+    """Scale by a linear gain with int16 saturation."""
+    if gain == 1.0 or not pcm:
+        return pcm
+    y = _i16(pcm).astype(np.float32) * float(gain)
+    return np.clip(np.rint(y), -32768, 32767).astype("<i2").tobytes()
+
+
+def silence_pcm16(duration_sec: float, sample_rate: int = 24000) -> bytes:
+    if duration_sec <= 0:
+        return b""
+    n_samples = int(sample_rate * duration_sec)
+    if n_samples <= 0:
+        return b""
+    return bytes(2 * n_samples)
+
+
+@lru_cache(maxsize=32)
+def _zero_frame(nbytes: int) -> bytes:
+    return bytes(nbytes)
+
+
+def silence_frames(duration_sec: float, sample_rate: int = 24000, *, frame_bytes: int = 4096) -> Iterator[bytes]:
+    """`duration_sec` of PCM16 silence as frame_bytes-sized frames (shared, cached objects)."""
+    total = 2 * int(sample_rate * duration_sec) if duration_sec > 0 else 0
+    frame_bytes = max(2, int(frame_bytes) & ~1)
+    whole, tail = divmod(total, frame_bytes)
+    frame = _zero_frame(frame_bytes)
+    for _ in range(whole):
+        yield frame
+    if tail:
+        yield _zero_frame(tail)
+
+
+def crossfade_pcm16(prev: bytes, nxt: bytes, *, ms: float = 5.0, sample_rate: int = 24000) -> bytes:
+    """
+    prev + nxt with the last/first `ms` overlapped by an equal-power fade (removes the click
+    at a hard splice). The result is shorter than prev + nxt by the overlap.
+    """
+    a = _i16(prev)
+    b = _i16(nxt)
+    n = min(int(sample_rate * ms / 1000.0), a.size, b.size)
+    if n <= 0:
+        return bytes(prev) + bytes(nxt)
+    t = (np.arange(n, dtype=np.float32) + 0.5) / n
+    fade_in = np.sin(0.5 * np.pi * t)
+    fade_out = np.cos(0.5 * np.pi * t)
+    mix = a[-n:].astype(np.float32) * fade_out + b[:n].astype(np.float32) * fade_in
+    mixed = np.clip(np.rint(mix), -32768, 32767).astype("<i2")
+    return a[:-n].tobytes() + mixed.tobytes() + b[n:].tobytes()
+
+
+def resample_pcm16(pcm: bytes, rate_in: int, rate_out: int) -> bytes:
+    """One-shot resample of a complete buffer (use StreamResampler for chunked input)."""
+    rs = StreamResampler(rate_in, rate_out)
+    if rs.passthrough:
+        return pcm
+    return rs.process(pcm) + rs.flush()
+
+
+@lru_cache(maxsize=16)
+def _sinc_bank(up: int, down: int, half_taps: int) -> np.ndarray:
+    """
+    (up, 2*half_taps) windowed-sinc filter bank; row p interpolates at fractional offset p/up.
+    Cutoff sits at the lower of the two Nyquist rates, so downsampling doesn't alias.
+    """
+    cutoff = min(1.0, up / float(down))
+    offsets = np.arange(-half_taps + 1, half_taps + 1, dtype=np.float64)  # tap j -> x[i + offset]
+    frac = np.arange(up, dtype=np.float64)[:, None] / up
+    t = offsets[None, :] - frac
+    window = 0.5 + 0.5 * np.cos(np.pi * np.clip(t / half_taps, -1.0, 1.0))
+    bank = cutoff * np.sinc(cutoff * t) * window
+    bank /= bank.sum(axis=1, keepdims=True)  # unity DC gain for every phase
+    return bank.astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Streaming PCM16LE mono resampler (rational ratio, polyphase windowed sinc, NumPy).
+
+    Every `process()` call is one vectorized gather + dot over the whole chunk; the last
+    few input samples and the fractional output position carry over to the next chunk,
+    so arbitrary chunk sizes give the same output as one big call.
+    """
+
+    def __init__(self, rate_in: int, rate_out: int, *, half_taps: int = 8):
+        self.rate_in = int(rate_in)
+        self.rate_out = int(rate_out)
+        g = gcd(self.rate_in, self.rate_out)
+        self.up = self.rate_out // g
+        self.down = self.rate_in // g
+        self.half_taps = int(half_taps)
+        self._bank = _sinc_bank(self.up, self.down, self.half_taps)
+        self._taps = np.arange(-self.half_taps + 1, self.half_taps + 1)
+        self.reset()
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def flush(self) -> bytes:
+        """End of stream: emit the samples still waiting for right-hand context, then reset."""
+        if self.passthrough:
+            return b""
+        out = self.process(bytes(2 * self.half_taps))
+        self.reset()
+        return out
+
+    def reset(self):
+        # K-1 zeros of history so the very first output has full left context
+        self._hist = np.zeros(self.half_taps - 1, dtype=np.float32)
+        self._t = (self.half_taps - 1) * self.up  # next output position, in 1/up input samples
+
+    def process(self, pcm: bytes) -> bytes:
+        if self.passthrough:
+            return pcm
+        if not pcm:
+            return b""
+
+        x = np.concatenate([self._hist, np.frombuffer(pcm, dtype="<i2").astype(np.float32)])
+        K, up, down = self.half_taps, self.up, self.down
+
+        last = (len(x) - K) * up - 1  # highest position whose right-hand taps are all present
+        n_out = (last - self._t) // down + 1 if last >= self._t else 0
+
+        if n_out > 0:
+            pos = self._t + down * np.arange(n_out, dtype=np.int64)
+            i = pos // up
+            phase = pos % up
+            y = np.einsum("nk,nk->n", x[i[:, None] + self._taps[None, :]], self._bank[phase])
+            out = np.clip(np.rint(y), -32768, 32767).astype("<i2").tobytes()
+            self._t = int(pos[-1]) + down
+        else:
+            out = b""
+
+        # keep only what the next output still needs
+        keep_from = max(0, min(len(x), self._t // up - (K - 1)))
+        self._hist = x[keep_from:]
+        self._t -= keep_from * up
+        return out
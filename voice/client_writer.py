@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+@dataclass
+class ClientWriterStats:
+    sent: int = 0
+    sent_bytes: int = 0
+    dropped_stale_audio: int = 0
+    dropped_debug: int = 0
+    coalesced_deltas: int = 0
+    audio_waits: int = 0
+    max_depth: int = 0
+
+
+class _Item:
+    __slots__ = ("text", "data", "gen", "ts", "parts")
+
+    def __init__(self, *, text: Optional[str] = None, data: Optional[bytes] = None, gen: int = -1, parts: Optional[List[str]] = None):
+        self.text = text
+        self.data = data
+        self.gen = gen
+        self.ts = time.monotonic()
+        self.parts = parts  # pending ai.text.delta pieces (serialized at send time)
+
+
+class ClientWriter:
+    """
+    Per-connection writer task: producers enqueue, one task awaits the socket.
+
+    Lanes, highest priority first:
+      control - every JSON message except debug events, strict FIFO (so ai.text.start,
+                ai.interrupt and stt/text events keep their relative order). Consecutive
+                ai.text.delta messages merge; a lone trailing delta is held up to
+                `delta_coalesce_ms` so a fast token stream goes out as ~50 ms batches.
+      audio   - TTS frames (binary or rt.audio.delta JSON) and rt.audio.silence, plus
+                rt.audio.end for a gen that still has frames queued. Bounded: producers await when full (the TTS loop
+                is the only thing a slow client should slow down). Frames whose gen is no
+                longer current are dropped at dequeue.
+      debug   - {"type": "event"} messages; bounded, oldest dropped first.
+    """
+
+    def __init__(
+        self,
+        send: Callable[..., Awaitable[Any]],
+        *,
+        current_gen: Callable[[], int],
+        on_error: Optional[Callable[[], None]] = None,
+        max_audio: int = 64,
+        max_debug: int = 256,
+        max_control: int = 2000,
+        delta_coalesce_ms: float = 50.0,
+    ):
+        self._send = send
+        self._current_gen = current_gen
+        self._on_error = on_error
+        self.max_audio = max(1, int(max_audio))
+        self.max_debug = max(1, int(max_debug))
+        self.max_control = max(1, int(max_control))
+        self.delta_coalesce_s = max(0.0, float(delta_coalesce_ms)) / 1000.0
+
+        self._control: Deque[_Item] = deque()
+        self._audio: Deque[_Item] = deque()
+        self._debug: Deque[_Item] = deque()
+        self._audio_by_gen: Dict[int, int] = {}
+
+        self._wake = asyncio.Event()
+        self._audio_space = asyncio.Event()
+        self._audio_space.set()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.stats = ClientWriterStats()
+
+    def start(self):
+        if self._task is None and not self.closed:
+            self._task = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        return len(self._control) + len(self._audio) + len(self._debug)
+
+    def _queued(self):
+        d = self.depth
+        if d > self.stats.max_depth:
+            self.stats.max_depth = d
+        self._wake.set()
+
+    # ---------------------------
+    # producers
+    # ---------------------------
+
+    def put_json(self, obj: dict):
+        if self.closed:
+            return
+        mtype = obj.get("type")
+
+        if mtype == "event":
+            if len(self._debug) >= self.max_debug:
+                self._debug.popleft()
+                self.stats.dropped_debug += 1
+            self._debug.append(_Item(text=json.dumps(obj)))
+        elif mtype == "ai.text.delta":
+            tail = self._control[-1] if self._control else None
+            if tail is not None and tail.parts is not None:
+                tail.parts.append(obj.get("delta") or "")
+                self.stats.coalesced_deltas += 1
+            else:
+                self._control.append(_Item(parts=[obj.get("delta") or ""]))
+        elif mtype == "rt.audio.end" and self._audio_by_gen.get(int(obj.get("gen", -1)), 0):
+            # must not overtake the frames it terminates
+            self._audio.append(_Item(text=json.dumps(obj), gen=-1))
+        else:
+            self._control.append(_Item(text=json.dumps(obj)))
+
+        if len(self._control) > self.max_control:
+            # hopelessly behind on small control messages: give up on this client
+            self._fail()
+            return
+        self._queued()
+
+    async def put_audio(self, gen: int, *, data: Optional[bytes] = None, text: Optional[str] = None):
+        """One TTS frame (binary `data` or serialized JSON `text`); waits while the audio lane is full."""
+        while not self.closed and len(self._audio) >= self.max_audio:
+            self.stats.audio_waits += 1
+            self._audio_space.clear()
+            await self._audio_space.wait()
+        if self.closed:
+            return
+        self._audio_by_gen[gen] = self._audio_by_gen.get(gen, 0) + 1
+        self._audio.append(_Item(text=text, data=data, gen=gen))
+        self._queued()
+
+    # ---------------------------
+    # writer task
+    # ---------------------------
+
+    def _pop_audio(self) -> Optional[_Item]:
+        cur = self._current_gen()
+        while self._audio:
+            item = self._audio.popleft()
+            if item.gen >= 0:
+                left = self._audio_by_gen.get(item.gen, 1) - 1
+                if left > 0:
+                    self._audio_by_gen[item.gen] = left
+                else:
+                    self._audio_by_gen.pop(item.gen, None)
+                if item.gen != cur:
+                    self.stats.dropped_stale_audio += 1
+                    continue
+            return item
+        return None
+
+    def _next(self) -> tuple[Optional[_Item], Optional[float]]:
+        """(item to send, or None + how long to sleep before a held delta is due)."""
+        hold: Optional[float] = None
+        if self._control:
+            head = self._control[0]
+            wait = head.ts + self.delta_coalesce_s - time.monotonic()
+            if head.parts is None or len(self._control) > 1 or wait <= 0:
+                return self._control.popleft(), None
+            hold = wait
+
+        item = self._pop_audio()
+        if len(self._audio) < self.max_audio:
+            self._audio_space.set()
+        if item is not None:
+            return item, None
+
+        if self._debug:
+            return self._debug.popleft(), None
+        return None, hold
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                item, hold = self._next()
+                if item is None:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=hold)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if item.parts is not None:
+                    text = json.dumps({"type": "ai.text.delta", "delta": "".join(item.parts)})
+                    await self._send(text_data=text)
+                    self.stats.sent_bytes += len(text)
+                elif item.data is not None:
+                    await self._send(bytes_data=item.data)
+                    self.stats.sent_bytes += len(item.data)
+                else:
+                    await self._send(text_data=item.text)
+                    self.stats.sent_bytes += len(item.text or "")
+                self.stats.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._fail()
+
+    def _fail(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._audio_space.set()  # release blocked producers
+        self._wake.set()
+        if self._on_error is not None:
+            self._on_error()
+
+    async def close(self, *, drain_timeout: float = 0.0):
+        """Stop the writer; optionally give already-queued messages `drain_timeout` seconds."""
+        if drain_timeout > 0 and self._task is not None and not self.closed:
+            deadline = time.monotonic() + drain_timeout
+            while self.depth and not self.closed and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        self.closed = True
+        self._audio_space.set()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        out = asdict(self.stats)
+        out["depth"] = self.depth
+        out["depth_audio"] = len(self._audio)
+        return out
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import math
 import os
 import re
-from typing import List, Tuple
+import struct
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 
 # def _db_filter_from_profile_id(profile_id: str):
@@ -22,44 +23,23 @@ def _debug_enabled() -> bool:
     return os.getenv("VOICE_DEBUG", "0") == "1"
 
 
-def _pcm16_stats_le(pcm_bytes: bytes) -> dict:
-    if not pcm_bytes:
-        return {"n": 0}
+# Binary audio frame header (audio_transport=binary), little-endian, 16 bytes:
+#   u8 version, u8 codec, u16 header length, u32 gen, u32 seq, u32 sample rate
+_AUDIO_FRAME_HEADER = struct.Struct("<BBHIII")
+_AUDIO_FRAME_VERSION = 1
+_AUDIO_CODEC_PCM16LE = 0
+_AUDIO_CODEC_OPUS = 1  # payload = exactly one Opus packet
 
-    n = len(pcm_bytes) // 2
-    if n <= 0:
-        return {"n": 0, "note": "odd_len"}
 
-    mn = 32767
-    mx = -32768
-    s2 = 0.0
-
-    step = max(1, n // 4000)
-    count = 0
-
-    for i in range(0, n, step):
-        lo = pcm_bytes[2 * i]
-        hi = pcm_bytes[2 * i + 1]
-        v = (hi << 8) | lo
-        if v >= 32768:
-            v -= 65536
-
-        mn = v if v < mn else mn
-        mx = v if v > mx else mx
-        s2 += float(v) * float(v)
-        count += 1
-
-    rms = math.sqrt(s2 / max(1, count))
-    return {"n": n, "min": mn, "max": mx, "rms": round(rms, 2), "bytes": len(pcm_bytes), "step": step}
-
-
-def _silence_pcm16(duration_sec: float, sample_rate: int = 24000) -> bytes:
-    if duration_sec <= 0:
-        return b""
-    n_samples = int(sample_rate * duration_sec)
-    if n_samples <= 0:
-        return b""
-    return b"\x00\x00" * n_samples
+def _pack_audio_frame_header(gen: int, seq: int, sample_rate: int, codec: int = _AUDIO_CODEC_PCM16LE) -> bytes:
+    return _AUDIO_FRAME_HEADER.pack(
+        _AUDIO_FRAME_VERSION,
+        codec,
+        _AUDIO_FRAME_HEADER.size,
+        int(gen) & 0xFFFFFFFF,
+        int(seq) & 0xFFFFFFFF,
+        int(sample_rate),
+    )
 
 
 def _normalize_text_for_tts(t: str) -> str:
@@ -72,7 +52,12 @@ def _normalize_text_for_tts(t: str) -> str:
     return t.strip()
 
 
-def _chunk_text_for_cadence(text: str, max_words_per_chunk: int = 10) -> List[Tuple[str, float]]:
+def _chunk_text_for_cadence(
+    text: str,
+    max_words_per_chunk: int = 10,
+    *,
+    final: bool = True,
+) -> List[Tuple[str, float]]:
     t = _normalize_text_for_tts(text)
     if not t:
         return []
@@ -133,8 +118,136 @@ def _chunk_text_for_cadence(text: str, max_words_per_chunk: int = 10) -> List[Tu
                     else:
                         add(seg, 0.16)
 
-    if out:
+    # Only the very end of a reply gets the shortened tail pause; partial text from
+    # the incremental segmenter keeps its natural pause because more speech follows.
+    if out and final:
         last_text, last_pause = out[-1]
         out[-1] = (last_text, min(last_pause, 0.22))
 
     return out
+
+
+# A sentence/phrase boundary only counts once something follows it; "3.5" or a
+# trailing "." mid-stream may still grow into something else.
+_CADENCE_BOUNDARY_RE = re.compile(r"[.?!,;:][\"')\]]*\s+")
+_CADENCE_WORD_RE = re.compile(r"\S+\s+")
+
+
+class _CadenceSegmenter:
+    """
+    Incremental front-end for _chunk_text_for_cadence.
+    Feed streamed LLM text deltas; get cadence chunks back as soon as a complete
+    sentence/phrase is available, so TTS can start before the reply is finished.
+    """
+
+    def __init__(self, max_words_per_chunk: int = 10):
+        self.max_words_per_chunk = max(1, int(max_words_per_chunk))
+        self.buf = ""
+
+    def _find_cut(self) -> int:
+        cut = 0
+        for m in _CADENCE_BOUNDARY_RE.finditer(self.buf):
+            cut = m.end()
+        if cut:
+            return cut
+
+        # No punctuation yet: release whole words once the phrase overflows a chunk.
+        words = 0
+        for m in _CADENCE_WORD_RE.finditer(self.buf):
+            words += 1
+            if words >= self.max_words_per_chunk:
+                return m.end()
+        return 0
+
+    def push(self, delta: str) -> List[Tuple[str, float]]:
+        if not delta:
+            return []
+        self.buf += delta
+
+        cut = self._find_cut()
+        if cut <= 0:
+            return []
+
+        ready, self.buf = self.buf[:cut], self.buf[cut:]
+        return _chunk_text_for_cadence(ready, self.max_words_per_chunk, final=False)
+
+    def flush(self) -> List[Tuple[str, float]]:
+        rest, self.buf = self.buf, ""
+        return _chunk_text_for_cadence(rest, self.max_words_per_chunk)
+
+
+class _AudioPacer:
+    """
+    Releases TTS audio at real-time rate, at most `lead_ms` ahead of the client's playback.
+
+    The playback clock starts at the first frame of a reply (the first `lead_ms` go out
+    immediately). If the sender falls behind real time (upstream stall), the clock restarts
+    from now instead of bursting to catch up. One reply (gen) at a time.
+    """
+
+    def __init__(self, lead_ms: float = 300.0):
+        self.lead_s = max(0.0, float(lead_ms) / 1000.0)
+        self.reset()
+
+    def reset(self, gen: int = -1):
+        self.gen = gen
+        self._t0: Optional[float] = None
+        self._sent_s = 0.0
+        self.waited_s = 0.0
+
+    def delay_for(self, duration_s: float, now: float) -> float:
+        """Seconds to wait before sending the next `duration_s` of audio."""
+        if self._t0 is None:
+            self._t0 = now
+        played = now - self._t0
+        if played > self._sent_s:
+            # client buffer ran dry: playback resumes with whatever arrives next
+            self._t0 = now - self._sent_s
+            played = self._sent_s
+        wait = max(0.0, (self._sent_s - played) - self.lead_s)
+        self._sent_s += max(0.0, duration_s)
+        self.waited_s += wait
+        return wait
+
+
+@dataclass
+class _SpeculativeResponse:
+    """
+    A response.create sent at end of speech, before the end-of-turn grace window expired.
+
+    Its text events are held in `events` until the grace timer confirms the turn (commit)
+    or new speech / transcript text supersedes it (drop). `item_ids` are the context items
+    injected for it, `output_item_ids` what it generated: both are deleted on drop.
+    """
+
+    text: str
+    ctx: Optional[dict] = None
+    state: str = "pending"  # pending | committed | dropped
+    sent: bool = False  # response.create went out
+    sent_ts: float = 0.0
+    event_id: str = ""  # client event_id of that response.create (matches a rejecting error)
+    response_id: Optional[str] = None
+    item_ids: List[str] = field(default_factory=list)
+    events: List[dict] = field(default_factory=list)
+    first_delta_ts: Optional[float] = None
+    done: bool = False  # response.done seen
+    status: str = ""
+    output_item_ids: List[str] = field(default_factory=list)
+    output_tokens: int = 0
+
+
+@dataclass
+class _SpeculationStats:
+    started: int = 0
+    committed: int = 0
+    dropped: int = 0
+    output_tokens: int = 0  # every response in the session
+    wasted_output_tokens: int = 0  # dropped / failed speculative responses
+    latency_saved_ms: float = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        out = asdict(self)
+        out["latency_saved_ms"] = round(self.latency_saved_ms, 1)
+        out["wasted_token_rate"] = round(self.wasted_output_tokens / max(1, self.output_tokens), 3)
+        out["avg_latency_saved_ms"] = round(self.latency_saved_ms / max(1, self.committed), 1)
+        return out
@@ -5,9 +5,11 @@ import base64
 import json
 import os
 import re
-import audioop
+import time
+import uuid
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Any, Deque, Dict, Optional, List, Tuple
 
 import websockets
 from channels.db import database_sync_to_async
@@ -15,24 +17,48 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from django.conf import settings
 from django.utils import timezone  # <-- ADDED (needed to end sessions)
 
-from .rag_factory import get_rag
+from .rag_factory import aget_rag
 from .memory_auto import extract_memories_via_openai, heuristic_gate
 from .providers.tts_elevenlabs import ElevenLabsTTS, ElevenLabsTTSConfig
+from .providers.tts_elevenlabs_ws import ElevenLabsWSTTS
+from .providers.realtime_pool import connect_realtime_ws, get_realtime_pool
+from .tts_cache import TTSAudioCache, get_tts_cache
+from .tts_prefetch import TTSPrefetcher
 
 from .prompting import PromptContext, build_system_prompt, build_reply_instructions
+from .prompt_cache import CompiledPrompt, aget_compiled_prompt, aset_compiled_prompt
 
 # Keep helper functions importable from consumers.py (backward compat)
 from .consumer_helpers import (
     # _db_filter_from_profile_id,
     _debug_enabled,
-    _pcm16_stats_le,
-    _silence_pcm16,
     _normalize_text_for_tts,
     _chunk_text_for_cadence,
+    _CadenceSegmenter,
+    _pack_audio_frame_header,
+    _AudioPacer,
+    _SpeculationStats,
+    _SpeculativeResponse,
+    _AUDIO_CODEC_OPUS,
+    _AUDIO_CODEC_PCM16LE,
 )
+from .audio_codecs import OPUS_FRAME_MS, OpusStreamDecoder, OpusStreamEncoder
+from .audio_dsp import StreamResampler, pcm16_rms, silence_frames
+from .client_writer import ClientWriter
+from .vad_gate import VadGate
 
 OPENAI_REALTIME_URL = settings.VOICE_APP.get("OPENAI_REALTIME_URL")
 
+# mic PCM rates accepted at session.start (input_sample_rate); upstream is always 24 kHz
+_MIC_SAMPLE_RATES = (8000, 16000, 24000, 44100, 48000)
+
+# _audio_q marker: send whatever the uplink batcher holds right now (ptt.up / local speech end)
+_MIC_FLUSH = b""
+
+# OpenAI response text events (held / dropped for speculative responses)
+_RESPONSE_TEXT_DELTA_EVENTS = ("response.output_text.delta", "response.text.delta")
+_RESPONSE_TEXT_DONE_EVENTS = ("response.output_text.done", "response.text.done")
+
 
 @dataclass
 class SessionCfg:
@@ -46,6 +72,23 @@ class SessionCfg:
     vad_silence_ms: int = 600
     vad_threshold: float = 0.55
 
+    # mic uplink batching: coalesce client frames into ~N ms input_audio_buffer.append events (0 = per frame)
+    mic_batch_ms: int = int(os.getenv("MIC_BATCH_MS", "80"))
+
+    # outbound TTS pacing: audio is released at real-time rate, this far ahead of playback (0 = burst)
+    tts_lead_ms: int = int(os.getenv("TTS_PACE_LEAD_MS", "300"))
+
+    # local energy VAD pre-gate: only speech (+ pre-roll / hangover) is streamed upstream
+    local_vad: bool = os.getenv("LOCAL_VAD_ENABLED", "0") == "1"
+    local_vad_min_dbfs: float = float(os.getenv("LOCAL_VAD_MIN_DBFS", "-50"))
+    local_vad_margin_db: float = float(os.getenv("LOCAL_VAD_MARGIN_DB", "10"))
+    local_vad_hangover_ms: int = int(os.getenv("LOCAL_VAD_HANGOVER_MS", "900"))
+    local_vad_preroll_ms: int = int(os.getenv("LOCAL_VAD_PREROLL_MS", "300"))
+    local_vad_keepalive_ms: int = int(os.getenv("LOCAL_VAD_KEEPALIVE_MS", "5000"))
+
+    # speculative response.create at end of speech, held until the grace window confirms the turn
+    speculative_response: bool = os.getenv("SPECULATIVE_RESPONSE_ENABLED", "0") == "1"
+
     loved_one_name: str = ""
     loved_one_relationship: str = ""
     loved_one_nickname_for_user: str = ""
@@ -63,11 +106,146 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
     async def _send_json(self, obj: dict):
         if getattr(self, "_ws_closed", False):
             return
+        writer = getattr(self, "_writer", None)
+        if writer is not None:
+            # never blocks: the writer task owns the socket (see ClientWriter for lanes/priorities)
+            writer.put_json(obj)
+            return
         try:
             await self.send(text_data=json.dumps(obj))
         except Exception:
             self._ws_closed = True
 
+    def _on_writer_error(self):
+        # Hopelessly behind (control-lane overflow) or the send failed: drop the client instead
+        # of keeping a session alive that can no longer talk to it. disconnect() does the teardown.
+        if getattr(self, "_ws_closed", False):
+            return
+        self._ws_closed = True
+        self._writer_close_task = asyncio.create_task(self._close_after_writer_error())
+
+    async def _close_after_writer_error(self):
+        try:
+            await self.close(code=1011)
+        except Exception:
+            pass
+
+    async def _send_audio_packet(self, payload: bytes | memoryview, gen: int, sample_rate: int, codec: int = _AUDIO_CODEC_PCM16LE):
+        if getattr(self, "_audio_binary", False):
+            if gen != self._audio_seq_gen:
+                self._audio_seq_gen = gen
+                self._audio_seq = 0
+            header = _pack_audio_frame_header(gen, self._audio_seq, sample_rate, codec)
+            self._audio_seq += 1
+            writer = getattr(self, "_writer", None)
+            if writer is not None:
+                await writer.put_audio(gen, data=header + payload)
+                return
+            try:
+                await self.send(bytes_data=header + payload)
+            except Exception:
+                self._ws_closed = True
+            return
+        b64 = base64.b64encode(payload).decode("ascii")
+        if codec == _AUDIO_CODEC_OPUS:
+            msg = {"type": "rt.audio.delta", "codec": "opus", "audio_b64": b64, "gen": gen}
+        else:
+            msg = {"type": "rt.audio.delta", "audio_b64": b64, "gen": gen}
+        writer = getattr(self, "_writer", None)
+        if writer is not None:
+            await writer.put_audio(gen, text=json.dumps(msg))
+            return
+        await self._send_json(msg)
+
+    def _opus_encoder_for(self, gen: int, sample_rate: int) -> OpusStreamEncoder:
+        enc = self._opus_enc
+        if enc is None or enc.sample_rate != int(sample_rate):
+            enc = OpusStreamEncoder(
+                sample_rate=sample_rate,
+                frame_ms=self._opus_frame_ms,
+                bitrate=int(os.getenv("TTS_OPUS_BITRATE", "32000")),
+            )
+            self._opus_enc = enc
+        elif gen != self._opus_gen:
+            enc.reset()  # leftovers from an older reply must never leak into this one
+        self._opus_gen = gen
+        return enc
+
+    async def _send_audio(self, pcm: bytes | memoryview, gen: int, sample_rate: int = 24000):
+        """
+        One outbound TTS audio frame. Binary (header + payload) when the client negotiated
+        audio_transport=binary in session.start, otherwise base64 in an rt.audio.delta JSON.
+        With audio_codec=opus the PCM goes through a per-gen streaming Opus encoder first.
+        """
+        if getattr(self, "_ws_closed", False) or not pcm:
+            return
+        if not await self._pace_audio(len(pcm), gen, sample_rate):
+            return
+        if self._audio_codec == "opus":
+            enc = self._opus_encoder_for(gen, sample_rate)
+            for pkt in enc.encode(pcm):
+                await self._send_audio_packet(pkt, gen, sample_rate, _AUDIO_CODEC_OPUS)
+            return
+        await self._send_audio_packet(pcm, gen, sample_rate)
+
+    async def _send_silence(self, duration_s: float, gen: int, sample_rate: int = 24000) -> bool:
+        """
+        A pause between TTS chunks: one rt.audio.silence {ms, gen} when the client negotiated
+        audio_silence=event, otherwise cached zero frames. False if `gen` went stale / client gone.
+        """
+        if not getattr(self, "_silence_events", False):
+            for frame in silence_frames(duration_s, sample_rate):
+                if self._ws_closed or gen != int(getattr(self, "_audio_gen", 0)):
+                    return False
+                await self._send_audio(frame, gen, sample_rate)
+            return True
+
+        nbytes = 2 * int(sample_rate * duration_s)
+        if self._ws_closed or nbytes <= 0:
+            return not self._ws_closed
+        if not await self._pace_audio(nbytes, gen, sample_rate):
+            return False
+        msg = {"type": "rt.audio.silence", "ms": round(nbytes / 2.0 * 1000.0 / sample_rate, 1), "gen": gen}
+        writer = getattr(self, "_writer", None)
+        if writer is not None:
+            # audio lane: must stay between the frames around it
+            await writer.put_audio(gen, text=json.dumps(msg))
+        else:
+            await self._send_json(msg)
+        return gen == int(getattr(self, "_audio_gen", 0)) and not self._ws_closed
+
+    async def _pace_audio(self, nbytes: int, gen: int, sample_rate: int) -> bool:
+        """
+        Hold a TTS frame until the client is at most `tts_lead_ms` ahead of playback, so an
+        interrupt only loses that much already-delivered audio. False if `gen` went stale meanwhile.
+        """
+        pacer = getattr(self, "_pacer", None)
+        if pacer is None or pacer.lead_s <= 0:
+            return True
+        if pacer.gen != gen:
+            pacer.reset(gen)
+        wait = pacer.delay_for(nbytes / 2.0 / float(sample_rate), asyncio.get_running_loop().time())
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return gen == int(getattr(self, "_audio_gen", 0)) and not self._ws_closed
+
+    async def _end_audio(self, gen: int):
+        """
+        rt.audio.end for `gen`; for Opus, first flush the encoder tail if `gen` is still current.
+        """
+        enc = self._opus_enc
+        if enc is not None and self._opus_gen == gen:
+            self._opus_gen = -1
+            if gen == int(getattr(self, "_audio_gen", 0)) and not self._ws_closed:
+                for pkt in enc.flush():
+                    await self._send_audio_packet(pkt, gen, enc.sample_rate, _AUDIO_CODEC_OPUS)
+            else:
+                enc.reset()
+        await self._send_json({"type": "rt.audio.end", "gen": gen})
+        writer = getattr(self, "_writer", None)
+        if writer is not None:
+            await self._send_json({"type": "event", "name": "ws.writer.stats", **writer.snapshot()})
+
     def _apply_config(self, content: dict):
         def i(key: str, default: int) -> int:
             try:
@@ -85,6 +263,38 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         self.cfg.vad_silence_ms = max(300, min(4000, i("vad_silence_ms", self.cfg.vad_silence_ms)))
         self.cfg.vad_threshold = max(0.05, min(0.95, f("vad_threshold", self.cfg.vad_threshold)))
         self.cfg.ptt_enabled = bool(content.get("ptt_enabled", self.cfg.ptt_enabled))
+        self.cfg.mic_batch_ms = max(0, min(200, i("mic_batch_ms", self.cfg.mic_batch_ms)))
+        self.cfg.tts_lead_ms = max(0, min(10000, i("tts_lead_ms", self.cfg.tts_lead_ms)))
+        pacer = getattr(self, "_pacer", None)
+        if pacer is not None:
+            pacer.lead_s = self.cfg.tts_lead_ms / 1000.0
+
+        self.cfg.local_vad = bool(content.get("local_vad", self.cfg.local_vad))
+        self.cfg.local_vad_min_dbfs = max(-90.0, min(-10.0, f("local_vad_min_dbfs", self.cfg.local_vad_min_dbfs)))
+        self.cfg.local_vad_margin_db = max(0.0, min(40.0, f("local_vad_margin_db", self.cfg.local_vad_margin_db)))
+        self.cfg.local_vad_hangover_ms = max(0, min(5000, i("local_vad_hangover_ms", self.cfg.local_vad_hangover_ms)))
+        self.cfg.local_vad_preroll_ms = max(0, min(1000, i("local_vad_preroll_ms", self.cfg.local_vad_preroll_ms)))
+        self.cfg.local_vad_keepalive_ms = max(0, min(60000, i("local_vad_keepalive_ms", self.cfg.local_vad_keepalive_ms)))
+        self._configure_vad_gate()
+
+        self.cfg.speculative_response = bool(content.get("speculative_response", self.cfg.speculative_response))
+
+    def _configure_vad_gate(self):
+        """(Re)apply local VAD settings; an existing gate keeps its noise floor + stats."""
+        if not self.cfg.local_vad:
+            self._vad_gate = None
+            return
+        gate = getattr(self, "_vad_gate", None)
+        if gate is None:
+            gate = self._vad_gate = VadGate()
+        gate.configure(
+            min_dbfs=self.cfg.local_vad_min_dbfs,
+            margin_db=self.cfg.local_vad_margin_db,
+            # the server VAD needs to hear vad_silence_ms of silence to end the turn
+            hangover_ms=max(self.cfg.local_vad_hangover_ms, self.cfg.vad_silence_ms + 200),
+            preroll_ms=self.cfg.local_vad_preroll_ms,
+            keepalive_ms=self.cfg.local_vad_keepalive_ms,
+        )
 
     @staticmethod
     def _truncate(s: str, max_chars: int) -> str:
@@ -249,21 +459,36 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         rows.reverse()
         return rows
 
-    async def _inject_recent_history_context(self):
-        """
-        Inject recent DB chat history as a system message before response.create.
-        This lets the model use your stored conversation as memory/context.
-        """
-        if self._openai_ws is None:
-            return
-
+    async def _load_recent_history(self) -> List[dict]:
         sid = int(getattr(self, "_conv_session_id", 0) or 0)
         if not sid:
+            return []
+        try:
+            return await self._db_get_recent_history(sid, max_msgs=int(os.getenv("HISTORY_MAX_MSGS", "14")))
+        except Exception:
+            return []
+
+    async def _store_turn_message(self, role: str, text: str):
+        try:
+            await self._db_add_message(int(getattr(self, "_conv_session_id", 0) or 0), role, text)
+        except Exception:
             return
+        self._history_writes += 1  # invalidates history prefetched before this write
 
-        max_msgs = int(os.getenv("HISTORY_MAX_MSGS", "14"))
-        rows = await self._db_get_recent_history(sid, max_msgs=max_msgs)
-        if not rows:
+    async def _send_system_item(self, text: str, item_ids: Optional[List[str]] = None):
+        """conversation.item.create for a system message; with `item_ids` it gets an id (appended) so it can be deleted."""
+        item = {"type": "message", "role": "system", "content": [{"type": "input_text", "text": text}]}
+        if item_ids is not None:
+            item["id"] = f"ctx_{uuid.uuid4().hex[:24]}"
+            item_ids.append(item["id"])
+        await self._send_openai({"type": "conversation.item.create", "item": item})
+
+    async def _inject_recent_history_context(self, rows: List[dict], item_ids: Optional[List[str]] = None):
+        """
+        Inject recent DB chat history as a system message before response.create.
+        This lets the model use your stored conversation as memory/context.
+        """
+        if self._openai_ws is None or not rows:
             return
 
         lines: List[str] = []
@@ -288,22 +513,107 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
             + "\nUse this for continuity with what was previously said.\n"
         )
 
-        await self._send_openai(
+        await self._send_system_item(history_text, item_ids)
+
+    # ==========================================================
+
+    async def _fetch_turn_context(self, text: str) -> Dict[str, Any]:
+        """Recent history + RAG docs for one user turn, fetched concurrently."""
+        writes = self._history_writes
+        t0 = time.perf_counter()
+
+        async def docs() -> List[str]:
+            try:
+                rag = await self.rag.aquery(
+                    profile_id=self.cfg.profile_id,
+                    loved_one_id=self.cfg.loved_one_id,
+                    query_text=text,
+                    k=6,
+                )
+                return rag.docs or []
+            except Exception as e:
+                return [f"(rag error: {type(e).__name__}: {e})"]
+
+        rows, rag_docs = await asyncio.gather(self._load_recent_history(), docs())
+        return {
+            "text": text,
+            "history": rows,
+            "docs": rag_docs,
+            "history_writes": writes,
+            "fetch_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+
+    def _start_turn_prefetch(self, snapshot: str):
+        """
+        Speculatively fetch the turn context for `snapshot` while the grace timer runs.
+        A prefetch for the same text is kept; one for older text is cancelled.
+        """
+        text = (snapshot or "").strip()
+        if not text or os.getenv("TURN_PREFETCH_ENABLED", "1") != "1" or self._looks_like_noise(text):
+            return
+        cur = self._turn_prefetch
+        if cur is not None and cur[0] == text and not cur[1].cancelled():
+            return
+        self._cancel_turn_prefetch()
+        self._turn_prefetch = (text, asyncio.create_task(self._fetch_turn_context(text)))
+
+    def _cancel_turn_prefetch(self):
+        cur, self._turn_prefetch = getattr(self, "_turn_prefetch", None), None
+        if cur is not None and not cur[1].done():
+            cur[1].cancel()
+
+    async def _take_turn_context(self, text: str) -> Dict[str, Any]:
+        """
+        Turn context for the final transcript: the prefetch when it was for exactly this
+        text (history re-read if a message was stored meanwhile), otherwise fetched now.
+        The user message itself is appended here; it is stored concurrently with the reply.
+        """
+        t0 = time.perf_counter()
+        cur, self._turn_prefetch = self._turn_prefetch, None
+        ctx: Optional[Dict[str, Any]] = None
+        if cur is not None and cur[0] == text:
+            try:
+                ctx = await cur[1]
+            except Exception:
+                ctx = None
+        elif cur is not None and not cur[1].done():
+            cur[1].cancel()
+
+        hit = ctx is not None
+        history_refetched = False
+        if ctx is None:
+            ctx = await self._fetch_turn_context(text)
+        elif ctx["history_writes"] != self._history_writes:
+            ctx["history"] = await self._load_recent_history()
+            history_refetched = True
+
+        max_msgs = int(os.getenv("HISTORY_MAX_MSGS", "14"))
+        if self._conv_session_id:
+            ctx["history"] = (list(ctx["history"]) + [{"role": "user", "content": text}])[-max_msgs:]
+
+        await self._send_json(
             {
-                "type": "conversation.item.create",
-                "item": {
-                    "type": "message",
-                    "role": "system",
-                    "content": [{"type": "input_text", "text": history_text}],
-                },
+                "type": "event",
+                "name": "turn.prefetch",
+                "hit": hit,
+                "history_refetched": history_refetched,
+                "fetch_ms": ctx["fetch_ms"],
+                "wait_ms": round((time.perf_counter() - t0) * 1000.0, 1),
             }
         )
-
-    # ==========================================================
+        return ctx
 
     async def _schedule_response_after_grace(self, snapshot: str, grace_ms: int):
+        self._start_turn_prefetch(snapshot)
+        loop = asyncio.get_running_loop()
+        fire_at = loop.time() + max(0.0, grace_ms / 1000.0)
+        spec: Optional[_SpeculativeResponse] = None
         try:
-            await asyncio.sleep(max(0.0, grace_ms / 1000.0))
+            if self._speculation_allowed(snapshot):
+                spec = _SpeculativeResponse(text=snapshot.strip())
+                await self._start_speculation(spec)
+
+            await asyncio.sleep(max(0.0, fire_at - loop.time()))
             if self._ws_closed:
                 return
 
@@ -317,15 +627,208 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
             self._pending_transcript = ""
             self._awaiting_transcript_after_stop = False
 
-            # ADDED: store FULL user message once per turn
-            try:
-                await self._db_add_message(int(getattr(self, "_conv_session_id", 0) or 0), "user", final_text)
-            except Exception:
-                pass
+            if spec is not None and spec.state == "pending" and spec.status not in ("cancelled", "failed"):
+                await asyncio.gather(
+                    self._store_turn_message("user", final_text),
+                    self._commit_speculation(spec),
+                )
+                return
+
+            if spec is not None:
+                ctx = spec.ctx
+                await self._drop_speculation(spec, f"response_{spec.status or 'lost'}")
+            else:
+                ctx = None if self._looks_like_noise(final_text) else await self._take_turn_context(final_text)
 
-            await self._inject_rag_for_turn_and_create_response(final_text)
+            # ADDED: store FULL user message once per turn (alongside the reply setup, which no longer reads it back)
+            await asyncio.gather(
+                self._store_turn_message("user", final_text),
+                self._inject_rag_for_turn_and_create_response(final_text, ctx),
+            )
         except asyncio.CancelledError:
             return
+        finally:
+            if spec is not None and spec.state == "pending":
+                await self._drop_speculation(spec, "superseded")
+
+    # ---------------------------
+    # speculative response.create (SessionCfg.speculative_response)
+    # ---------------------------
+
+    def _speculation_allowed(self, snapshot: str) -> bool:
+        t = (snapshot or "").strip()
+        return bool(
+            self.cfg.speculative_response
+            and self._openai_ws is not None
+            and self._spec is None
+            and not self._spec_awaiting_id
+            and not self._response_in_flight
+            and not self._rt_response_active
+            and self._ends_thought(t)
+            and not self._looks_like_noise(t)
+        )
+
+    async def _start_speculation(self, spec: _SpeculativeResponse):
+        """
+        Turn context + response.create for a transcript that still has grace time left.
+        The context items get ids so a dropped speculation can delete them again.
+        """
+        self._spec = spec
+        self._spec_stats.started += 1
+        spec.ctx = await self._take_turn_context(spec.text)
+        await self._inject_turn_context(spec.ctx, spec.item_ids)
+
+        spec.sent = True
+        spec.sent_ts = asyncio.get_running_loop().time()
+        self._spec_seq += 1
+        spec.event_id = f"spec_create_{self._spec_seq}"
+        self._spec_awaiting_id.append(spec)
+        await self._send_openai(
+            {
+                "type": "response.create",
+                "event_id": spec.event_id,
+                "response": {"instructions": build_reply_instructions(spec.text)},
+            }
+        )
+        await self._send_json({"type": "event", "name": "response.speculation.started", "chars": len(spec.text)})
+
+    async def _commit_speculation(self, spec: _SpeculativeResponse):
+        """The grace window confirmed the turn: start the reply and release what was held."""
+        now = asyncio.get_running_loop().time()
+        spec.state = "committed"
+        self._last_user_transcript = spec.text
+        self._ai_started = True
+        self._response_in_flight = True
+        self._last_assistant_text = ""
+
+        # without speculation response.create would go out now and the first delta come ttft later
+        head_start = now - spec.sent_ts
+        saved = head_start if spec.first_delta_ts is None else min(head_start, spec.first_delta_ts - spec.sent_ts)
+        st = self._spec_stats
+        st.committed += 1
+        st.latency_saved_ms += saved * 1000.0
+
+        gen = self._bump_audio_gen("ai.text.start")
+        await self._send_json({"type": "ai.text.start", "gen": gen})
+        try:
+            # the reader keeps appending to spec.events until this loop has drained them
+            while spec.events:
+                await self._handle_response_text_event(spec.events.pop(0))
+        finally:
+            if self._spec is spec:
+                self._spec = None
+        await self._send_json(
+            {
+                "type": "event",
+                "name": "response.speculation.stats",
+                "result": "committed",
+                "saved_ms": round(saved * 1000.0, 1),
+                **st.snapshot(),
+            }
+        )
+
+    async def _drop_speculation(self, spec: _SpeculativeResponse, reason: str):
+        """New speech / transcript text (or a failed response): cancel it and remove its items."""
+        if self._spec is spec:
+            self._spec = None
+        if spec.state == "dropped":
+            return
+        spec.state = "dropped"
+        spec.events.clear()
+        self._spec_stats.dropped += 1
+        await self._send_json({"type": "event", "name": "response.speculation.dropped", "reason": reason})
+        if self._openai_ws is None or self._ws_closed:
+            return
+
+        if spec.sent and not spec.done:
+            self._spec_seq += 1
+            cancel_id = f"spec_cancel_{self._spec_seq}"
+            self._spec_cancel_ids.append(cancel_id)
+            msg: Dict[str, Any] = {"type": "response.cancel", "event_id": cancel_id}
+            if spec.response_id:
+                msg["response_id"] = spec.response_id
+            await self._send_openai(msg)
+        for item_id in spec.item_ids:
+            await self._send_openai({"type": "conversation.item.delete", "item_id": item_id})
+        if spec.done or not spec.sent:
+            await self._settle_dropped_speculation(spec)
+
+    async def _settle_dropped_speculation(self, spec: _SpeculativeResponse):
+        """A dropped speculation's response has ended: delete its output, count its tokens as wasted."""
+        for item_id in spec.output_item_ids:
+            await self._send_openai({"type": "conversation.item.delete", "item_id": item_id})
+        st = self._spec_stats
+        st.wasted_output_tokens += spec.output_tokens
+        await self._send_json(
+            {
+                "type": "event",
+                "name": "response.speculation.stats",
+                "result": "dropped",
+                "wasted_tokens": spec.output_tokens,
+                **st.snapshot(),
+            }
+        )
+
+    def _on_response_created(self, ev: dict):
+        self._rt_response_active = True
+        rid = (ev.get("response") or {}).get("id") or ""
+        if self._spec_awaiting_id:
+            # responses are created in request order, and speculation only starts when none is active
+            spec = self._spec_awaiting_id.popleft()
+            spec.response_id = rid
+            if rid:
+                self._spec_by_id[rid] = spec
+
+    async def _on_response_done(self, ev: dict):
+        self._rt_response_active = False
+        resp = ev.get("response") or {}
+        tokens = int((resp.get("usage") or {}).get("output_tokens") or 0)
+        self._spec_stats.output_tokens += tokens
+
+        spec = self._spec_by_id.pop(resp.get("id") or "", None)
+        if spec is None:
+            return
+        spec.done = True
+        spec.status = str(resp.get("status") or "")
+        spec.output_tokens = tokens
+        spec.output_item_ids = [it["id"] for it in (resp.get("output") or []) if isinstance(it, dict) and it.get("id")]
+        if spec.state == "dropped":
+            await self._settle_dropped_speculation(spec)
+
+    def _on_speculation_error(self, ev: dict) -> bool:
+        """
+        True if this error is speculation bookkeeping noise: the response.cancel of a dropped
+        speculation raced with the response ending on its own. Also marks a speculation whose
+        response.create was rejected (never created) as done.
+        """
+        err = ev.get("error") or {}
+        eid = err.get("event_id")
+        if err.get("code") == "response_cancel_not_active":
+            if eid and eid in self._spec_cancel_ids:
+                self._spec_cancel_ids.remove(eid)
+                return True
+            return False
+        for spec in list(self._spec_awaiting_id):
+            if eid and spec.event_id == eid:
+                self._spec_awaiting_id.remove(spec)
+                spec.done = True
+                spec.status = "failed"
+        return False
+
+    def _hold_speculative_event(self, ev: dict) -> bool:
+        """Route a response text event: held for a pending speculation, dropped for a dropped one."""
+        rid = ev.get("response_id") or ""
+        spec = self._spec_by_id.get(rid) if rid else self._spec
+        if spec is None:
+            return False
+        if spec.state == "dropped":
+            return True
+        if spec is not self._spec:
+            return False  # committed and drained: normal handling
+        if spec.first_delta_ts is None and ev.get("type") in _RESPONSE_TEXT_DELTA_EVENTS:
+            spec.first_delta_ts = asyncio.get_running_loop().time()
+        spec.events.append(ev)
+        return True
 
     def _cancel_pending_response(self):
         t = self._pending_response_task
@@ -360,17 +863,35 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         await self._cancel_tts()
         await self._cancel_openai_response()
         gen = self._bump_audio_gen(reason)
+        if self._opus_enc is not None:
+            self._opus_enc.reset()
+            self._opus_gen = -1
         await self._send_json({"type": "ai.interrupt", "gen": gen, "reason": reason})
         # Explicit end marker so frontend can flush immediately
-        await self._send_json({"type": "rt.audio.end", "gen": gen})
+        await self._end_audio(gen)
 
     async def connect(self):
         self._ws_closed = False
+        # generation counter to invalidate stale TTS audio after barge-in / interrupt
+        self._audio_gen: int = 0
+        # outbound messages go through one writer task per connection
+        self._writer = ClientWriter(
+            self.send,
+            current_gen=lambda: int(getattr(self, "_audio_gen", 0)),
+            on_error=self._on_writer_error,
+            max_audio=int(os.getenv("WS_WRITER_MAX_AUDIO_FRAMES", "64")),
+            delta_coalesce_ms=float(os.getenv("WS_TEXT_COALESCE_MS", "50")),
+        )
         await self.accept()
+        self._writer.start()
         await self._send_json({"type": "session.connecting"})
 
         self.cfg = SessionCfg()
-        self.rag = get_rag()
+        self._pacer = _AudioPacer(self.cfg.tts_lead_ms)
+        self._vad_gate: Optional[VadGate] = None
+        self._configure_vad_gate()
+        # shared per-process backend (cheap after the first connection / lifespan warm-up)
+        self.rag = await aget_rag()
 
         # Authenticated user from TokenAuthMiddleware (?access_token=…)
         self._user = self.scope.get("user", None)
@@ -382,8 +903,37 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         self._task_in: Optional[asyncio.Task] = None
         self._tts_task: Optional[asyncio.Task] = None
 
-        # generation counter to invalidate stale TTS audio after barge-in / interrupt
-        self._audio_gen: int = 0
+        # incremental TTS: cadence chunks of the reply currently streaming from OpenAI
+        self._tts_q: Optional[asyncio.Queue] = None
+        self._tts_seg: Optional[_CadenceSegmenter] = None
+        self._tts_stream_gen: int = -1
+
+        # outbound audio transport (negotiated in session.start): base64 JSON or binary frames
+        self._audio_binary: bool = False
+        self._audio_seq_gen: int = -1
+        self._audio_seq: int = 0
+        # outbound codec (negotiated in session.start): pcm16 or opus (one streaming encoder, reset per gen)
+        self._audio_codec: str = "pcm16"
+        self._opus_frame_ms: int = 20
+        self._opus_enc: Optional[OpusStreamEncoder] = None
+        self._opus_gen: int = -1
+        # pauses between TTS chunks (negotiated in session.start): rt.audio.silence events or zero PCM
+        self._silence_events: bool = False
+        # inbound mic (negotiated in session.start): pcm16 @ 8/16/24/48k or opus, normalized to 24k PCM16
+        self._mic_codec: str = "pcm16"
+        self._mic_rate: int = 24000
+        self._mic_decoder: Optional[OpusStreamDecoder] = None
+        self._mic_resampler: Optional[StreamResampler] = None
+        self._mic_decode_warned: bool = False
+        # uplink batching: local speech-end detection + per-session counters (mic.uplink.stats)
+        self._mic_voiced: bool = False
+        self._mic_quiet_ms: float = 0.0
+        self._mic_unbatched_until: float = 0.0
+        self._mic_frames_in: int = 0
+        self._mic_msgs_out: int = 0
+        self._mic_bytes_out: int = 0
+        self._mic_cpu_s: float = 0.0
+        self._mic_first_ts: float = 0.0
 
         self._last_user_transcript: str = ""
         self._last_assistant_text: str = ""
@@ -398,6 +948,18 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         self._user_speaking: bool = False
         self._pending_transcript: str = ""
         self._pending_response_task: Optional[asyncio.Task] = None
+        # speculative (transcript snapshot, history + RAG fetch) started with the grace timer
+        self._turn_prefetch: Optional[Tuple[str, asyncio.Task]] = None
+        self._history_writes: int = 0
+        # speculative response.create: the pending one, ones awaiting response.created, and by response id
+        self._spec: Optional[_SpeculativeResponse] = None
+        self._spec_awaiting_id: Deque[_SpeculativeResponse] = deque()
+        self._spec_by_id: Dict[str, _SpeculativeResponse] = {}
+        self._spec_seq: int = 0
+        # event_ids of dropped speculations' response.cancel (a cancel racing response.done errors)
+        self._spec_cancel_ids: Deque[str] = deque(maxlen=16)
+        self._spec_stats = _SpeculationStats()
+        self._rt_response_active: bool = False
 
         # faster default; override via env END_OF_TURN_GRACE_MS if you want
         self._end_of_turn_grace_ms: int = int(os.getenv("END_OF_TURN_GRACE_MS", "450"))
@@ -422,6 +984,7 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         if t and not t.done():
             t.cancel()
         self._pending_response_task = None
+        self._cancel_turn_prefetch()
 
         # ADDED: end DB conversation session
         try:
@@ -431,12 +994,68 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
 
         await self._cancel_tts()
         await self._shutdown_openai()
+        await self._writer.close()
 
     async def _cancel_tts(self):
         t = self._tts_task
         if t and not t.done():
             t.cancel()
         self._tts_task = None
+        self._tts_q = None
+        self._tts_seg = None
+        self._tts_stream_gen = -1
+
+    @staticmethod
+    def _tts_incremental_enabled() -> bool:
+        # Full-text mode (TTS_DISABLE_CHUNKING) needs the whole reply anyway.
+        if os.getenv("TTS_DISABLE_CHUNKING", "0") == "1":
+            return False
+        return os.getenv("TTS_INCREMENTAL", "1") == "1"
+
+    async def _tts_stream_push(self, delta: str, gen: int):
+        """
+        Feed an assistant text delta into the incremental TTS pipeline.
+        Speech starts on the first complete phrase while the model is still generating.
+        """
+        if not self._tts_incremental_enabled():
+            return
+
+        if self._tts_q is None or self._tts_stream_gen != gen:
+            await self._cancel_tts()
+            self._tts_q = asyncio.Queue()
+            self._tts_seg = _CadenceSegmenter(int(os.getenv("TTS_MAX_WORDS_PER_CHUNK", "10")))
+            self._tts_stream_gen = gen
+
+        assert self._tts_seg is not None
+        for item in self._tts_seg.push(delta):
+            self._tts_q.put_nowait(item)
+
+        if self._tts_task is None and not self._tts_q.empty():
+            self._tts_task = asyncio.create_task(self._speak_elevenlabs_chunks(self._tts_q, gen))
+
+    async def _tts_stream_finish(self, gen: int) -> bool:
+        """
+        Flush the remaining reply text into the incremental pipeline and close it.
+        Returns False if no incremental stream exists for this gen.
+        """
+        q, seg = self._tts_q, self._tts_seg
+        if q is None or seg is None or self._tts_stream_gen != gen:
+            return False
+
+        for item in seg.flush():
+            q.put_nowait(item)
+        q.put_nowait(None)
+
+        self._tts_q = None
+        self._tts_seg = None
+        self._tts_stream_gen = -1
+
+        if self._tts_task is None:
+            if q.qsize() > 1:
+                self._tts_task = asyncio.create_task(self._speak_elevenlabs_chunks(q, gen))
+            else:
+                await self._end_audio(gen)
+        return True
 
     async def _cancel_openai_response(self):
         if self._response_in_flight:
@@ -445,6 +1064,36 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         self._ai_started = False
         self._last_assistant_text = ""
 
+    def _setup_mic_input(self, content: Dict[str, Any]):
+        """
+        input_codec: pcm16 (default) | opus; input_sample_rate: 8000/16000/24000/44100/48000 for pcm16.
+        Upstream to OpenAI is always 24 kHz PCM16, so anything else is decoded/resampled here.
+        """
+        codec = str(content.get("input_codec") or "pcm16").strip().lower()
+        self._mic_codec = "opus" if codec == "opus" else "pcm16"
+        try:
+            rate = int(content.get("input_sample_rate") or 24000)
+        except Exception:
+            rate = 24000
+        self._mic_rate = rate if rate in _MIC_SAMPLE_RATES else 24000
+        self._mic_decode_warned = False
+
+        self._mic_decoder = None
+        self._mic_resampler = None
+        if self._mic_codec == "opus":
+            self._mic_rate = 48000  # what libopus decodes to; resampled to 24k inside the decoder
+            self._mic_decoder = OpusStreamDecoder(sample_rate=24000)
+        elif self._mic_rate != 24000:
+            self._mic_resampler = StreamResampler(self._mic_rate, 24000)
+
+    def _decode_mic(self, data: bytes) -> bytes:
+        """One client mic message -> 24 kHz PCM16LE (may be empty while the resampler fills)."""
+        if self._mic_decoder is not None:
+            return self._mic_decoder.decode(data)
+        if self._mic_resampler is not None:
+            return self._mic_resampler.process(data[: len(data) & ~1])
+        return data
+
     async def receive(self, text_data=None, bytes_data=None):
         if self._ws_closed:
             return
@@ -453,14 +1102,36 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
             if self.cfg.ptt_enabled and (not self.cfg.ptt_down):
                 return
             try:
+                bytes_data = self._decode_mic(bytes_data)
+            except Exception:
+                if not self._mic_decode_warned:
+                    self._mic_decode_warned = True
+                    await self._send_json({"type": "warn", "note": "mic_decode_failed_drop", "codec": self._mic_codec})
+                return
+            if not bytes_data:
+                return
+            try:
+                speech_end = False
                 try:
-                    rms_i16 = audioop.rms(bytes_data, 2)
+                    rms_i16 = pcm16_rms(bytes_data)
                     self._mic_rms = (0.85 * self._mic_rms) + (0.15 * (rms_i16 / 32768.0))
                     self._mic_rms_ts = asyncio.get_running_loop().time()
+                    speech_end = self._track_mic_speech_end(rms_i16 / 32768.0, len(bytes_data))
                 except Exception:
                     pass
 
-                self._audio_q.put_nowait(bytes_data)
+                self._mic_frames_in += 1
+                frames = [bytes_data]
+                segment_end = False
+                gate = self._vad_gate  # a session.config may swap / drop it while we're suspended
+                if gate is not None and not self.cfg.ptt_enabled:
+                    frames, segment_end = gate.process(bytes_data)
+                for fr in frames:
+                    self._audio_q.put_nowait(fr)
+                if speech_end:
+                    self._audio_q.put_nowait(_MIC_FLUSH)
+                if gate is not None and segment_end:
+                    await self._send_json({"type": "event", "name": "mic.vad.stats", **gate.snapshot()})
             except asyncio.QueueFull:
                 await self._send_json({"type": "warn", "note": "audio_queue_full_drop"})
             return
@@ -492,38 +1163,20 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                 return
 
             self._apply_config(content)
-
-            ok = await self._load_persona_from_db(self.cfg.profile_id, self.cfg.loved_one_id)
-            if not ok:
-                await self._send_json({"type": "error", "error": "loved_one not found"})
-                return
-
-            if not (self.cfg.eleven_voice_id or "").strip():
-                await self._send_json(
-                    {
-                        "type": "error",
-                        "error": "no_cloned_voice",
-                        "detail": "This Loved One has no cloned ElevenLabs voice yet. Upload voice samples first and wait for cloning to complete.",
-                    }
-                )
-                return
-
-            # ADDED: create DB conversation session (once per websocket session)
+            self._audio_binary = (str(content.get("audio_transport") or "json").strip().lower() == "binary")
+            self._audio_codec = "opus" if str(content.get("audio_codec") or "").strip().lower() == "opus" else "pcm16"
             try:
-                self._conv_session_id = await self._db_create_conversation_session(self.cfg.profile_id, self.cfg.loved_one_id)
+                frame_ms = int(content.get("opus_frame_ms") or os.getenv("TTS_OPUS_FRAME_MS", "20"))
             except Exception:
-                self._conv_session_id = 0
-
-            await self._send_json(
-                {
-                    "type": "session.started",
-                    "profile_id": self.cfg.profile_id,
-                    "loved_one_id": self.cfg.loved_one_id,
-                    "conv_session_id": self._conv_session_id,
-                    "authenticated": bool(user and getattr(user, "is_authenticated", False)),
-                }
+                frame_ms = 20
+            self._opus_frame_ms = frame_ms if frame_ms in OPUS_FRAME_MS else 20
+            # Opus keeps encoded silence: the client decodes asynchronously, so an event
+            # could overtake packets still in its decoder (and silent packets are tiny anyway)
+            self._silence_events = (
+                str(content.get("audio_silence") or "pcm").strip().lower() == "event" and self._audio_codec == "pcm16"
             )
-            await self._startup_openai()
+            self._setup_mic_input(content)
+            await self._bootstrap_session(user)
             return
 
         if mtype == "session.config":
@@ -536,6 +1189,10 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                         "vad_silence_ms": self.cfg.vad_silence_ms,
                         "vad_threshold": self.cfg.vad_threshold,
                         "ptt_enabled": self.cfg.ptt_enabled,
+                        "mic_batch_ms": self.cfg.mic_batch_ms,
+                        "tts_lead_ms": self.cfg.tts_lead_ms,
+                        "local_vad": self.cfg.local_vad,
+                        "speculative_response": self.cfg.speculative_response,
                     },
                 }
             )
@@ -549,6 +1206,10 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
 
         if mtype == "ptt.up":
             self.cfg.ptt_down = False
+            try:
+                self._audio_q.put_nowait(_MIC_FLUSH)
+            except asyncio.QueueFull:
+                pass
             await self._send_json({"type": "event", "name": "ptt.up"})
             return
 
@@ -581,36 +1242,146 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
 
         return True
 
-    async def _startup_openai(self):
-        if self._openai_ws is not None:
+    # ==========================================================
+    # session.start bootstrap
+    #
+    #   openai connect -> session.update ............................\
+    #   persona (DB) -> [rag index | compiled prompt | session row] --> system prompt -> pumps
+    # ==========================================================
+
+    async def _bootstrap_session(self, user):
+        t_start = time.perf_counter()
+        timings: dict = {}
+
+        async def timed(name: str, aw):
+            t0 = time.perf_counter()
+            try:
+                return await aw
+            finally:
+                timings[name] = round((time.perf_counter() - t0) * 1000.0, 1)
+
+        # The upstream handshake is the slowest step and needs nothing from the DB.
+        openai_task: Optional[asyncio.Task] = None
+        if self._openai_ws is None:
+            openai_task = asyncio.create_task(timed("openai_total", self._startup_openai(timings)))
+
+        async def abort(err: dict):
+            if openai_task is not None:
+                openai_task.cancel()
+                await asyncio.gather(openai_task, return_exceptions=True)
+                await self._shutdown_openai()
+            await self._send_json(err)
+
+        try:
+            ok = await timed("persona_db", self._load_persona_from_db(self.cfg.profile_id, self.cfg.loved_one_id))
+        except asyncio.CancelledError:
+            if openai_task is not None:
+                openai_task.cancel()
+            raise
+        except Exception as e:
+            await abort({"type": "error", "error": "persona_load_failed", "detail": f"{type(e).__name__}: {e}"})
+            return
+        if not ok:
+            await abort({"type": "error", "error": "loved_one not found"})
             return
 
+        if not (self.cfg.eleven_voice_id or "").strip():
+            await abort(
+                {
+                    "type": "error",
+                    "error": "no_cloned_voice",
+                    "detail": "This Loved One has no cloned ElevenLabs voice yet. Upload voice samples first and wait for cloning to complete.",
+                }
+            )
+            return
+
+        # Independent once the persona is known: hot vector index, persona prompt (cache or
+        # bootstrap RAG) and the conversation row (ADDED: once per websocket session).
+        index_res, prompt_res, conv_res = await asyncio.gather(
+            timed("rag_index", self.rag.aload_index(profile_id=self.cfg.profile_id, loved_one_id=self.cfg.loved_one_id)),
+            timed("system_prompt_build", self._compile_system_prompt()),
+            timed("conv_session_db", self._db_create_conversation_session(self.cfg.profile_id, self.cfg.loved_one_id)),
+            return_exceptions=True,
+        )
+
+        if isinstance(index_res, BaseException):
+            print(f"RAG index load failed: {type(index_res).__name__}: {index_res}")
+        else:
+            # Hot vector index for this loved one, so per-turn retrieval skips the Chroma search.
+            await self._send_json(
+                {"type": "event", "name": "rag.index.loaded", "rows": index_res, "ms": timings.get("rag_index", 0.0)}
+            )
+
+        self._conv_session_id = 0 if isinstance(conv_res, BaseException) else conv_res
+
+        openai_ok = self._openai_ws is not None  # repeated session.start: upstream already running
+        if openai_task is not None:
+            res = await asyncio.gather(openai_task, return_exceptions=True)
+            openai_ok = res[0] is True
+
+            if openai_ok:
+                t0 = time.perf_counter()
+                if isinstance(prompt_res, BaseException):
+                    await self._send_openai_system_prompt()  # rebuild (reports its own rag error text)
+                else:
+                    await self._send_openai_system_prompt(prompt_res)
+                timings["system_prompt_send"] = round((time.perf_counter() - t0) * 1000.0, 1)
+                self._task_out = asyncio.create_task(self._pump_audio_to_openai())
+                self._task_in = asyncio.create_task(self._pump_events_from_openai())
+
+        timings["total"] = round((time.perf_counter() - t_start) * 1000.0, 1)
+        await self._send_json(
+            {
+                "type": "session.started",
+                "profile_id": self.cfg.profile_id,
+                "loved_one_id": self.cfg.loved_one_id,
+                "conv_session_id": self._conv_session_id,
+                "authenticated": bool(user and getattr(user, "is_authenticated", False)),
+                "openai_ready": openai_ok,
+                "openai_warm": bool(getattr(self, "_openai_warm", False)),
+                "audio_transport": "binary" if self._audio_binary else "json",
+                "audio_codec": self._audio_codec,
+                "audio_silence": "event" if self._silence_events else "pcm",
+                "input_codec": self._mic_codec,
+                "input_sample_rate": self._mic_rate,
+                "timings_ms": timings,
+            }
+        )
+
+    async def _startup_openai(self, timings: Optional[dict] = None) -> bool:
+        """
+        Connect to OpenAI Realtime and send the initial session.update.
+        The system prompt + pumps are started by _bootstrap_session once the persona is known.
+        """
+        if self._openai_ws is not None:
+            return True
+        timings = timings if timings is not None else {}
+
         api_key = settings.VOICE_APP.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY", "")
         if not api_key:
             await self._send_json({"type": "error", "error": "OPENAI_API_KEY missing"})
-            return
-
-        headers = {"Authorization": f"Bearer {api_key}"}
+            return False
 
+        t0 = time.perf_counter()
+        warm = False
         try:
-            self._openai_ws = await websockets.connect(
-                OPENAI_REALTIME_URL,
-                additional_headers=headers,
-                max_size=20 * 1024 * 1024,
-            )
-        except TypeError:
-            self._openai_ws = await websockets.connect(
-                OPENAI_REALTIME_URL,
-                extra_headers=headers,
-                max_size=20 * 1024 * 1024,
-            )
+            pool = get_realtime_pool()
+            if pool is not None:
+                self._openai_ws, warm = await pool.claim()
+            else:
+                self._openai_ws = await connect_realtime_ws(OPENAI_REALTIME_URL, api_key)
+        except Exception as e:
+            await self._send_json({"type": "error", "error": "openai_connect_failed", "detail": f"{type(e).__name__}: {e}"})
+            return False
+        timings["openai_connect"] = round((time.perf_counter() - t0) * 1000.0, 1)
+        self._openai_warm = warm
 
-        await self._send_json({"type": "event", "name": "openai.ws.connected"})
-        await self._send_openai_session_update(initial=True)
-        await self._send_openai_system_prompt()
+        await self._send_json({"type": "event", "name": "openai.ws.connected", "warm": warm})
 
-        self._task_out = asyncio.create_task(self._pump_audio_to_openai())
-        self._task_in = asyncio.create_task(self._pump_events_from_openai())
+        t1 = time.perf_counter()
+        await self._send_openai_session_update(initial=True)
+        timings["openai_session_update"] = round((time.perf_counter() - t1) * 1000.0, 1)
+        return self._openai_ws is not None
 
     async def _shutdown_openai(self):
         for t in [self._task_out, self._task_in]:
@@ -685,21 +1456,7 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
             }
         )
 
-    async def _send_openai_system_prompt(self):
-        try:
-            # normalize profile_id for RAG filters
-            profile_key = self.cfg.profile_id
-
-            rag = self.rag.query(
-                profile_id=profile_key,
-                loved_one_id=self.cfg.loved_one_id,
-                query_text="session_bootstrap",
-                k=5,
-            )
-            memories = "\n".join(f"- {d}" for d in rag.docs) if getattr(rag, "docs", None) else "(none)"
-        except Exception as e:
-            memories = f"(rag error: {type(e).__name__}: {e})"
-
+    def _build_persona_block(self) -> str:
         persona_lines = []
         if self.cfg.loved_one_name:
             persona_lines.append(f"Name: {self.cfg.loved_one_name}")
@@ -724,7 +1481,33 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         if self.cfg.core_memories:
             persona_lines.append("Core memories (high priority, treat as true): " + self.cfg.core_memories)
 
-        persona_block = "\n".join(persona_lines) if persona_lines else "(not provided)"
+        return "\n".join(persona_lines) if persona_lines else "(not provided)"
+
+    async def _compile_system_prompt(self) -> Tuple[str, bool]:
+        """
+        Persona block + session_bootstrap memories + system text, from the shared prompt
+        cache when possible. Returns (system_text, cache_hit).
+        """
+        persona_block = self._build_persona_block()
+        compiled = await aget_compiled_prompt(self.cfg.profile_id, self.cfg.loved_one_id, persona_block)
+        if compiled is not None:
+            return compiled.system_text, True
+
+        rag_ok = True
+        try:
+            # normalize profile_id for RAG filters
+            profile_key = self.cfg.profile_id
+
+            rag = await self.rag.aquery(
+                profile_id=profile_key,
+                loved_one_id=self.cfg.loved_one_id,
+                query_text="session_bootstrap",
+                k=5,
+            )
+            memories = "\n".join(f"- {d}" for d in rag.docs) if getattr(rag, "docs", None) else "(none)"
+        except Exception as e:
+            rag_ok = False
+            memories = f"(rag error: {type(e).__name__}: {e})"
 
         ctx = PromptContext(
             profile_id=self.cfg.profile_id,
@@ -734,6 +1517,21 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         )
         system_text = build_system_prompt(ctx)
 
+        if rag_ok:  # never pin a transient RAG error into the shared cache
+            await aset_compiled_prompt(
+                CompiledPrompt(
+                    profile_id=self.cfg.profile_id,
+                    loved_one_id=self.cfg.loved_one_id,
+                    persona_block=persona_block,
+                    memories_block=memories,
+                    system_text=system_text,
+                )
+            )
+        return system_text, False
+
+    async def _send_openai_system_prompt(self, compiled: Optional[Tuple[str, bool]] = None):
+        system_text, cached = compiled if compiled is not None else await self._compile_system_prompt()
+
         await self._send_openai(
             {
                 "type": "conversation.item.create",
@@ -744,9 +1542,9 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                 },
             }
         )
-        await self._send_json({"type": "event", "name": "openai.system_prompt.sent"})
+        await self._send_json({"type": "event", "name": "openai.system_prompt.sent", "cached": cached})
 
-    async def _inject_rag_for_turn_and_create_response(self, transcript: str):
+    async def _inject_rag_for_turn_and_create_response(self, transcript: str, ctx: Optional[Dict[str, Any]] = None):
         if self._openai_ws is None:
             return
 
@@ -756,25 +1554,28 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
             return
 
         self._last_user_transcript = t
+        if ctx is None:
+            ctx = await self._fetch_turn_context(t)
+
+        await self._inject_turn_context(ctx)
+
+        reply_style = build_reply_instructions(t)
 
+        self._ai_started = True
+        self._response_in_flight = True
+        self._last_assistant_text = ""
+        gen = self._bump_audio_gen("ai.text.start")
+        await self._send_json({"type": "ai.text.start", "gen": gen})
+        await self._send_openai({"type": "response.create", "response": {"instructions": reply_style}})
+
+    async def _inject_turn_context(self, ctx: Dict[str, Any], item_ids: Optional[List[str]] = None):
         # ADDED: inject recent DB conversation history as context
         try:
-            await self._inject_recent_history_context()
+            await self._inject_recent_history_context(ctx["history"], item_ids)
         except Exception:
             pass
 
-        try:
-            profile_key = self.cfg.profile_id
-
-            rag = self.rag.query(
-                profile_id=profile_key,
-                loved_one_id=self.cfg.loved_one_id,
-                query_text=t,
-                k=6,
-            )
-            docs = rag.docs or []
-        except Exception as e:
-            docs = [f"(rag error: {type(e).__name__}: {e})"]
+        docs = ctx["docs"]
 
         max_total_chars = 1400
         picked = []
@@ -796,35 +1597,97 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                 + "\n"
                 "Use these as first-person memories. If not relevant, ignore.\n"
             )
-            await self._send_openai(
-                {
-                    "type": "conversation.item.create",
-                    "item": {
-                        "type": "message",
-                        "role": "system",
-                        "content": [{"type": "input_text", "text": context_text}],
-                    },
-                }
-            )
+            await self._send_system_item(context_text, item_ids)
 
-        reply_style = build_reply_instructions(t)
+    def _track_mic_speech_end(self, rms: float, nbytes: int) -> bool:
+        """
+        Cheap local end-of-speech detector for the uplink batcher: True once per utterance,
+        after MIC_SPEECH_END_MS of frames below MIC_SPEECH_RMS. The server VAD still decides turns;
+        this only makes sure the trailing audio (and the silence after it) isn't held in a batch.
+        """
+        frame_ms = nbytes / 48.0  # 24 kHz PCM16
+        if rms >= float(os.getenv("MIC_SPEECH_RMS", "0.015")):
+            self._mic_voiced = True
+            self._mic_quiet_ms = 0.0
+            return False
+        if not self._mic_voiced:
+            return False
+        self._mic_quiet_ms += frame_ms
+        if self._mic_quiet_ms < float(os.getenv("MIC_SPEECH_END_MS", "100")):
+            return False
+        self._mic_voiced = False
+        # stream the following silence unbatched so server VAD sees it as soon as it happens
+        self._mic_unbatched_until = asyncio.get_running_loop().time() + (self.cfg.vad_silence_ms + 200) / 1000.0
+        return True
 
-        self._ai_started = True
-        self._response_in_flight = True
-        self._last_assistant_text = ""
-        gen = self._bump_audio_gen("ai.text.start")
-        await self._send_json({"type": "ai.text.start", "gen": gen})
-        await self._send_openai({"type": "response.create", "response": {"instructions": reply_style}})
+    async def _append_mic_audio(self, pcm: bytes):
+        c0 = time.process_time()
+        msg = {"type": "input_audio_buffer.append", "audio": base64.b64encode(pcm).decode("ascii")}
+        self._mic_cpu_s += time.process_time() - c0
+        self._mic_msgs_out += 1
+        self._mic_bytes_out += len(pcm)
+        await self._send_openai(msg)
+
+    async def _send_mic_uplink_stats(self, reason: str):
+        elapsed = max(1e-6, asyncio.get_running_loop().time() - self._mic_first_ts)
+        await self._send_json(
+            {
+                "type": "event",
+                "name": "mic.uplink.stats",
+                "reason": reason,
+                "batch_ms": self.cfg.mic_batch_ms,
+                "frames_in": self._mic_frames_in,
+                "messages_out": self._mic_msgs_out,
+                "messages_per_sec": round(self._mic_msgs_out / elapsed, 1),
+                "avg_message_ms": round(self._mic_bytes_out / 48.0 / max(1, self._mic_msgs_out), 1),
+                "encode_cpu_ms": round(self._mic_cpu_s * 1000.0, 2),
+            }
+        )
 
     async def _pump_audio_to_openai(self):
+        """
+        Coalesce queued mic frames into one input_audio_buffer.append per `mic_batch_ms` of audio
+        (or per byte budget, whichever comes first). A _MIC_FLUSH marker sends the partial batch.
+        """
         assert self._openai_ws is not None
+        loop = asyncio.get_running_loop()
+        buf = bytearray()
+        started = 0.0
+        self._mic_first_ts = loop.time()
         while not self._ws_closed and self._openai_ws is not None:
+            batch_ms = self.cfg.mic_batch_ms
+            if loop.time() < self._mic_unbatched_until:
+                batch_ms = 0
             try:
-                chunk = await self._audio_q.get()
+                if buf and batch_ms > 0:
+                    wait_s = batch_ms / 1000.0 - (loop.time() - started)
+                    chunk = await asyncio.wait_for(self._audio_q.get(), timeout=max(0.0, wait_s))
+                else:
+                    chunk = await self._audio_q.get()
+            except asyncio.TimeoutError:
+                chunk = None  # batch window elapsed
             except asyncio.CancelledError:
                 return
-            b64 = base64.b64encode(chunk).decode("ascii")
-            await self._send_openai({"type": "input_audio_buffer.append", "audio": b64})
+
+            if chunk:
+                if not buf:
+                    started = loop.time()
+                buf.extend(chunk)
+                # drain whatever is already queued without yielding
+                while len(buf) < batch_ms * 48 and not self._audio_q.empty():
+                    more = self._audio_q.get_nowait()
+                    if not more:
+                        chunk = more
+                        break
+                    buf.extend(more)
+                if chunk and len(buf) < batch_ms * 48 and (loop.time() - started) * 1000.0 < batch_ms:
+                    continue
+
+            if buf:
+                await self._append_mic_audio(bytes(buf))
+                buf.clear()
+            if chunk == _MIC_FLUSH:
+                await self._send_mic_uplink_stats("ptt.up" if self.cfg.ptt_enabled else "speech_end")
 
     async def _fire_auto_memory(self, assistant_text: str, from_event: str):
         await self._send_json(
@@ -881,12 +1744,13 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
         existing = set()
         try:
             profile_key = self.cfg.profile_id
-            recent = self.rag.query(
+            res = await self.rag.aquery(
                 profile_id=profile_key,
                 loved_one_id=self.cfg.loved_one_id,
                 query_text=user_text,
                 k=10,
-            ).docs
+            )
+            recent = res.docs
             existing = set((d or "").strip().lower() for d in (recent or []))
         except Exception:
             existing = set()
@@ -929,12 +1793,35 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
     async def _save_memory_to_db_and_rag(self, profile_key: str, loved_one_id: int, text: str):
         memory_id = await self._db_create_memory(profile_key, loved_one_id, text)
 
-        self.rag.add_memory(profile_id=profile_key, loved_one_id=loved_one_id, text=text, memory_id=str(memory_id))
+        await self.rag.aadd_memory(profile_id=profile_key, loved_one_id=loved_one_id, text=text, memory_id=str(memory_id))
         await self._send_json({"type": "event", "name": "memory.auto.saved", "memory_id": str(memory_id)})
 
     async def _speak_elevenlabs(self, text: str, gen: int):
+        """
+        Speak a complete reply: chunk it for cadence up-front and run the chunk loop.
+        """
+        if os.getenv("TTS_DISABLE_CHUNKING", "0") == "1":
+            chunks = [(_normalize_text_for_tts(text), 0.0)]
+        else:
+            chunks = _chunk_text_for_cadence(
+                text,
+                max_words_per_chunk=int(os.getenv("TTS_MAX_WORDS_PER_CHUNK", "10")),
+            )
+
+        q: asyncio.Queue = asyncio.Queue()
+        for item in chunks:
+            q.put_nowait(item)
+        q.put_nowait(None)
+        await self._speak_elevenlabs_chunks(q, gen)
+
+    async def _speak_elevenlabs_chunks(self, chunks: asyncio.Queue, gen: int):
+        """
+        Synthesize (chunk_text, pause_after) items from `chunks` until a None sentinel.
+        The queue may still be filling while we speak (incremental TTS).
+        """
         await self._send_json({"type": "event", "name": "tts.elevenlabs.start", "gen": gen})
 
+        prefetch: Optional[TTSPrefetcher] = None
         try:
             voice_id = (self.cfg.eleven_voice_id or "").strip()
             api_key = settings.VOICE_APP.get("ELEVENLABS_API_KEY") or os.getenv("ELEVENLABS_API_KEY", "")
@@ -944,12 +1831,12 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
 
             if not api_key:
                 await self._send_json({"type": "warn", "note": "elevenlabs_api_key_missing_no_audio"})
-                await self._send_json({"type": "rt.audio.end", "gen": gen})
+                await self._end_audio(gen)
                 return
 
             if not voice_id:
                 await self._send_json({"type": "warn", "note": "no_cloned_voice_id_no_audio"})
-                await self._send_json({"type": "rt.audio.end", "gen": gen})
+                await self._end_audio(gen)
                 return
 
             stream_output_format = "pcm_24000"
@@ -969,57 +1856,163 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                 timeout_sec=float(os.getenv("ELEVENLABS_TTS_TIMEOUT_SEC", "60")),
                 speed=float(os.getenv("ELEVENLABS_TTS_SPEED", "0.90")),
             )
+            if (settings.VOICE_APP.get("TTS_PROVIDER") or "").strip().lower() == "elevenlabs_ws":
+                ws_tts = ElevenLabsWSTTS(cfg, swap_endian=swap_endian)
+                if await self._stream_elevenlabs_ws(ws_tts, chunks, gen):
+                    await self._end_audio(gen)
+                return
+
             tts = ElevenLabsTTS(cfg, swap_endian=swap_endian)
 
             if disable_chunking:
-                chunks = [(_normalize_text_for_tts(text), 0.0)]
                 inter_chunk_pause = 0.0
             else:
-                chunks = _chunk_text_for_cadence(
-                    text,
-                    max_words_per_chunk=int(os.getenv("TTS_MAX_WORDS_PER_CHUNK", "10")),
-                )
                 inter_chunk_pause = float(os.getenv("TTS_INTER_CHUNK_PAUSE_SEC", "0.08"))
 
-            for chunk_text, pause_after in chunks:
+            # Repeated phrases (greetings, catch phrase, short acknowledgements) come from cache.
+            cache = get_tts_cache()
+            voice_settings = tts._voice_settings_payload()
+
+            def synth(chunk_text: str):
+                if cache is None:
+                    return tts.stream_pcm(chunk_text)
+                key = TTSAudioCache.make_key(
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    output_format=stream_output_format,
+                    voice_settings=voice_settings,
+                    text=chunk_text,
+                    swap_endian=swap_endian,
+                )
+                return cache.stream(
+                    key,
+                    lambda uncacheable: tts.stream_pcm(chunk_text, on_fallback=uncacheable),
+                    frame_bytes=cfg.frame_bytes,
+                )
+
+            # Next N chunks synthesize while the current one is being sent; order stays strict.
+            prefetch = TTSPrefetcher(synth, depth=int(os.getenv("TTS_PREFETCH_CHUNKS", "2")))
+            prefetch.start(chunks)
+
+            async for chunk_text, pause_after, frames in prefetch:
                 if self._ws_closed:
                     return
                 if gen != int(getattr(self, "_audio_gen", 0)):
                     return
-                if not (chunk_text or "").strip():
-                    continue
 
-                async for pcm_chunk in tts.stream_pcm(chunk_text):
+                async for pcm_chunk in frames:
                     if self._ws_closed:
                         return
                     if gen != int(getattr(self, "_audio_gen", 0)):
                         return
-                    b64 = base64.b64encode(pcm_chunk).decode("ascii")
-                    await self._send_json({"type": "rt.audio.delta", "audio_b64": b64, "gen": gen})
+                    await self._send_audio(pcm_chunk, gen, pcm_rate)
 
                 total_pause = max(0.0, inter_chunk_pause + float(pause_after))
-                sil = _silence_pcm16(total_pause, sample_rate=pcm_rate)
-                if sil:
-                    frame = 4096
-                    for i in range(0, len(sil), frame):
-                        if self._ws_closed:
-                            return
-                        b64 = base64.b64encode(sil[i : i + frame]).decode("ascii")
-                        if gen != int(getattr(self, "_audio_gen", 0)):
-                            return
-                        await self._send_json({"type": "rt.audio.delta", "audio_b64": b64, "gen": gen})
-                        await asyncio.sleep(0)
-
-            await self._send_json({"type": "rt.audio.end", "gen": gen})
+                if total_pause > 0 and not await self._send_silence(total_pause, gen, pcm_rate):
+                    return
+
+            await self._end_audio(gen)
 
         except asyncio.CancelledError:
-            await self._send_json({"type": "rt.audio.end", "gen": gen})
+            await self._end_audio(gen)
             raise
         except Exception as e:
             await self._send_json({"type": "warn", "note": f"tts.elevenlabs.failed: {type(e).__name__}: {e}"})
-            await self._send_json({"type": "rt.audio.end", "gen": gen})
+            await self._end_audio(gen)
         finally:
-            await self._send_json({"type": "event", "name": "tts.elevenlabs.done", "gen": gen})
+            # Drop every in-flight prefetch (barge-in, gen bump, error or normal end).
+            if prefetch is not None:
+                await prefetch.aclose()
+                cache = get_tts_cache()
+                if cache is not None:
+                    await self._send_json({"type": "event", "name": "tts.cache.stats", **cache.snapshot()})
+            await self._send_json(
+                {
+                    "type": "event",
+                    "name": "tts.elevenlabs.done",
+                    "gen": gen,
+                    "pace_lead_ms": self.cfg.tts_lead_ms,
+                    "pace_wait_ms": round(self._pacer.waited_s * 1000.0, 1),
+                }
+            )
+
+    async def _stream_elevenlabs_ws(self, tts: ElevenLabsWSTTS, chunks: asyncio.Queue, gen: int) -> bool:
+        """
+        One input-streaming socket for the whole reply: cadence chunks are pushed as they
+        arrive while PCM is read back concurrently. Pauses are left to the model's prosody.
+        Returns False if the reply went stale (gen bump / client gone) mid-stream.
+        """
+        await tts.open()
+
+        async def feed():
+            try:
+                while True:
+                    item = await chunks.get()
+                    if item is None:
+                        break
+                    chunk_text, _pause_after = item
+                    await tts.send_text(chunk_text)
+                await tts.finish()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # unblock the reader below; the error is re-raised from `await feeder`
+                await tts.abort()
+                raise
+
+        feeder = asyncio.create_task(feed())
+        try:
+            async for pcm_chunk in tts.frames():
+                if self._ws_closed:
+                    return False
+                if gen != int(getattr(self, "_audio_gen", 0)):
+                    return False
+                await self._send_audio(pcm_chunk, gen)
+            await feeder
+            return True
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+            await tts.abort()
+
+    async def _handle_response_text_event(self, ev: dict):
+        et = ev.get("type", "")
+        if et in _RESPONSE_TEXT_DELTA_EVENTS:
+            delta = ev.get("delta") or ""
+            if delta:
+                if not self._ai_started:
+                    self._ai_started = True
+                    self._last_assistant_text = ""
+                    gen = self._bump_audio_gen("ai.text.start.delta")
+                    await self._send_json({"type": "ai.text.start", "gen": gen})
+                self._last_assistant_text += delta
+                await self._send_json({"type": "ai.text.delta", "delta": delta})
+                await self._tts_stream_push(delta, int(getattr(self, "_audio_gen", 0)))
+            return
+
+        text = (ev.get("text") or self._last_assistant_text or "").strip()
+        self._last_assistant_text = text
+        self._response_in_flight = False
+        self._ai_started = False
+
+        # ADDED: store FULL assistant reply once per turn
+        await self._store_turn_message("assistant", text)
+
+        await self._send_json({"type": "ai.text.final", "text": text})
+        await self._fire_auto_memory(text, et)
+
+        gen = int(getattr(self, "_audio_gen", 0))
+        if await self._tts_stream_finish(gen):
+            # Already speaking incrementally; the rest of the reply was just flushed.
+            return
+
+        await self._cancel_tts()
+        if text:
+            self._tts_task = asyncio.create_task(self._speak_elevenlabs(text, gen))
+        else:
+            gen2 = int(getattr(self, "_audio_gen", 0))
+            await self._end_audio(gen2)
 
     async def _pump_events_from_openai(self):
         assert self._openai_ws is not None
@@ -1038,7 +2031,16 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                 await self._send_json({"type": "event", "name": "openai.event", "openai_type": et})
 
                 if et in ("error", "invalid_request_error"):
-                    await self._send_json({"type": "error", "error": ev})
+                    if not self._on_speculation_error(ev):
+                        await self._send_json({"type": "error", "error": ev})
+                    continue
+
+                if et == "response.created":
+                    self._on_response_created(ev)
+                    continue
+
+                if et == "response.done":
+                    await self._on_response_done(ev)
                     continue
 
                 if et == "input_audio_buffer.speech_started":
@@ -1113,40 +2115,9 @@ class RealtimeVoiceConsumer(AsyncWebsocketConsumer):
                             )
                     continue
 
-                if et in ("response.output_text.delta", "response.text.delta"):
-                    delta = ev.get("delta") or ""
-                    if delta:
-                        if not self._ai_started:
-                            self._ai_started = True
-                            self._last_assistant_text = ""
-                            gen = self._bump_audio_gen("ai.text.start.delta")
-                            await self._send_json({"type": "ai.text.start", "gen": gen})
-                        self._last_assistant_text += delta
-                        await self._send_json({"type": "ai.text.delta", "delta": delta})
-                    continue
-
-                if et in ("response.output_text.done", "response.text.done"):
-                    text = (ev.get("text") or self._last_assistant_text or "").strip()
-                    self._last_assistant_text = text
-                    self._response_in_flight = False
-                    self._ai_started = False
-
-                    # ADDED: store FULL assistant reply once per turn
-                    try:
-                        await self._db_add_message(int(getattr(self, "_conv_session_id", 0) or 0), "assistant", text)
-                    except Exception:
-                        pass
-
-                    await self._send_json({"type": "ai.text.final", "text": text})
-                    await self._fire_auto_memory(text, et)
-
-                    await self._cancel_tts()
-                    if text:
-                        gen = int(getattr(self, "_audio_gen", 0))
-                        self._tts_task = asyncio.create_task(self._speak_elevenlabs(text, gen))
-                    else:
-                        gen2 = int(getattr(self, "_audio_gen", 0))
-                        await self._send_json({"type": "rt.audio.end", "gen": gen2})
+                if et in _RESPONSE_TEXT_DELTA_EVENTS or et in _RESPONSE_TEXT_DONE_EVENTS:
+                    if not self._hold_speculative_event(ev):
+                        await self._handle_response_text_event(ev)
                     continue
 
         except asyncio.CancelledError:
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+
+# all-MiniLM-L6-v2 = BERT encoder -> mean pooling -> L2 normalize (384 dims).
+MINILM_HF_ID = "sentence-transformers/all-MiniLM-L6-v2"
+MINILM_MAX_SEQ_LEN = 256
+MINILM_DIM = 384
+
+
+class EmbedderBase(ABC):
+    name: str = ""
+    dim: int = MINILM_DIM
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Return a float32 array of shape (len(texts), dim)."""
+        raise NotImplementedError
+
+
+class SentenceTransformerEmbedder(EmbedderBase):
+    """
+    Reference backend: full PyTorch sentence-transformers model.
+    """
+
+    name = "sentence_transformers"
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        # Imported lazily so the ONNX backend never pulls torch into the worker.
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(list(texts)), dtype=np.float32)
+
+
+class OnnxMiniLMEmbedder(EmbedderBase):
+    """
+    ONNX Runtime backend for an exported all-MiniLM-L6-v2 (see `manage.py voice_export_onnx`).
+
+    `model_dir` holds model.onnx (and model.int8.onnx when quantized) plus the HF fast
+    tokenizer's tokenizer.json. Pooling + normalization mirror the sentence-transformers
+    pipeline, so fp32 vectors match existing Chroma vectors to float precision.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, *, quantized: bool = False, intra_op_threads: int = 1):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = "model.int8.onnx" if quantized else "model.onnx"
+        model_path = os.path.join(model_dir, model_file)
+        tok_path = os.path.join(model_dir, "tokenizer.json")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"ONNX embedder model missing: {model_path} (run manage.py voice_export_onnx)")
+
+        self.tokenizer = Tokenizer.from_file(tok_path)
+        self.tokenizer.enable_truncation(max_length=MINILM_MAX_SEQ_LEN)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = max(1, int(intra_op_threads))
+        so.inter_op_num_threads = 1
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, sess_options=so, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.quantized = bool(quantized)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        enc = self.tokenizer.encode_batch(texts)
+        input_ids = np.asarray([e.ids for e in enc], dtype=np.int64)
+        attention_mask = np.asarray([e.attention_mask for e in enc], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.asarray([e.type_ids for e in enc], dtype=np.int64)
+
+        hidden = np.asarray(self.session.run(None, feeds)[0])  # (n, seq, dim)
+
+        # mean pooling over real tokens, then L2 normalize (sentence-transformers Normalize)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (hidden * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+        norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return (pooled / norms).astype(np.float32)
+
+
+_EMBEDDER: Optional[EmbedderBase] = None
+_EMBEDDER_LOCK = threading.Lock()
+
+
+def build_embedder(backend: str = "") -> EmbedderBase:
+    from django.conf import settings
+
+    cfg = settings.VOICE_APP
+    backend = (backend or cfg.get("EMBEDDER") or "sentence_transformers").strip().lower()
+
+    if backend in ("sentence_transformers", "sentence-transformers", "torch"):
+        return SentenceTransformerEmbedder()
+
+    if backend == "onnx":
+        return OnnxMiniLMEmbedder(
+            cfg.get("ONNX_EMBEDDER_DIR", ""),
+            quantized=bool(cfg.get("ONNX_EMBEDDER_QUANTIZED", False)),
+            intra_op_threads=int(cfg.get("ONNX_EMBEDDER_THREADS", 1) or 1),
+        )
+
+    raise ValueError(f"Unsupported EMBEDDER backend: {backend}")
+
+
+def get_embedder() -> EmbedderBase:
+    """
+    Process-wide embedder selected by VOICE_APP["EMBEDDER"].
+    """
+    global _EMBEDDER
+    if _EMBEDDER is None:
+        with _EMBEDDER_LOCK:
+            if _EMBEDDER is None:
+                _EMBEDDER = build_embedder()
+    return _EMBEDDER
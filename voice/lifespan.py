@@ -0,0 +1,71 @@
+"""
+ASGI lifespan handler for per-worker voice resources.
+
+Usage (in asgi.py):
+    from voice.lifespan import VoiceLifespanApp
+    ...
+    "lifespan": VoiceLifespanApp()
+
+Uvicorn sends ``lifespan.startup`` / ``lifespan.shutdown`` once per worker process.
+Servers without lifespan support simply never call it; resources are then created
+lazily on first use.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from .providers.http_pool import close_http_sessions, get_http_session
+from .providers.realtime_pool import close_realtime_pools, get_realtime_pool
+from .rag_base import run_rag_blocking, shutdown_rag_executor
+from .rag_factory import shutdown_rag, warm_up_rag
+
+logger = logging.getLogger(__name__)
+
+
+async def _startup():
+    # Open the pooled TTS HTTP session up-front so the first reply doesn't pay for it.
+    get_http_session()
+
+    # Start filling the OpenAI Realtime warm pool (no-op when OPENAI_RT_POOL_SIZE=0).
+    get_realtime_pool()
+
+    # Build the shared RAG backend + load the embedder before the first session connects.
+    if os.getenv("RAG_WARMUP", "1") == "1":
+        try:
+            await run_rag_blocking(warm_up_rag)
+        except Exception as e:
+            # Not fatal: get_rag() will retry lazily on first connection.
+            logger.error(f"RAG warm-up failed: {type(e).__name__}: {e}")
+
+
+async def _shutdown():
+    await close_http_sessions()
+    await close_realtime_pools()
+    shutdown_rag()
+    shutdown_rag_executor()
+
+
+class VoiceLifespanApp:
+    async def __call__(self, scope, receive, send):
+        while True:
+            message = await receive()
+            mtype = message.get("type")
+
+            if mtype == "lifespan.startup":
+                try:
+                    await _startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": f"{type(e).__name__}: {e}"})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+
+            elif mtype == "lifespan.shutdown":
+                try:
+                    await _shutdown()
+                except Exception as e:
+                    await send({"type": "lifespan.shutdown.failed", "message": f"{type(e).__name__}: {e}"})
+                    return
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,675 @@
+"""
+Local micro-benchmarks / smoke checks for the voice pipeline.
+
+    python manage.py voice_bench --list
+    python manage.py voice_bench tts_ws
+
+No API keys needed. Network benches run against in-process fakes; rag_* benches use
+the real local Chroma + embedding stack (model weights must be available locally).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _ms(sec: float) -> float:
+    return round(sec * 1000.0, 2)
+
+
+# ---------------------------------------------------------------------------
+# tts_ws: ElevenLabsWSTTS against a fake stream-input server emitting canned PCM
+# ---------------------------------------------------------------------------
+
+async def _bench_tts_ws(stdout) -> dict:
+    from unittest import mock
+
+    import websockets
+
+    from voice.providers.tts_elevenlabs import ElevenLabsTTSConfig
+    from voice.providers.tts_elevenlabs_ws import ElevenLabsWSTTS
+    from voice.testing import fake_eleven_stream_input
+
+    pcm = b"\x01\x00" * 12000  # 0.5s @ 24kHz per fragment
+    fragments = ["Hey, ", "it's really good ", "to hear from you. ", "How was today?"]
+
+    async with websockets.serve(lambda ws: fake_eleven_stream_input(ws, pcm), "127.0.0.1", 0) as server:
+        port = list(server.sockets)[0].getsockname()[1]
+        with mock.patch.dict(os.environ, {"ELEVENLABS_BASE_URL": f"http://127.0.0.1:{port}"}):
+            tts = ElevenLabsWSTTS(ElevenLabsTTSConfig(api_key="fake", voice_id="fake-voice"))
+            t0 = time.perf_counter()
+            await tts.open()
+
+            async def feed():
+                for frag in fragments:
+                    await tts.send_text(frag)
+                    await asyncio.sleep(0.02)
+                await tts.finish()
+
+            feeder = asyncio.create_task(feed())
+            first = None
+            total = 0
+            n_frames = 0
+            async for frame in tts.frames():
+                if first is None:
+                    first = time.perf_counter() - t0
+                total += len(frame)
+                n_frames += 1
+            await feeder
+            await tts.abort()
+            elapsed = time.perf_counter() - t0
+
+    # byte-count / EOS / abort correctness: voice.tests.ElevenLabsWSTTSTests
+
+    return {
+        "fragments": len(fragments),
+        "frames": n_frames,
+        "pcm_bytes": total,
+        "ttfb_ms": _ms(first or 0.0),
+        "total_ms": _ms(elapsed),
+    }
+
+
+# ---------------------------------------------------------------------------
+# rag_connect: connect -> session.ready latency, shared RAG vs per-connection RAG
+# ---------------------------------------------------------------------------
+
+def _rss_mb() -> float:
+    """Current RSS (Linux /proc); 0.0 where unavailable."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024.0, 1)
+    except OSError:
+        pass
+    return 0.0
+
+
+async def _connect_to_ready_ms(app) -> float:
+    from channels.testing import WebsocketCommunicator
+
+    comm = WebsocketCommunicator(app, "/ws/voice/")
+    t0 = time.perf_counter()
+    connected, _ = await comm.connect(timeout=120)
+    if not connected:
+        raise CommandError("rag_connect: websocket connect failed")
+    while True:
+        msg = await comm.receive_json_from(timeout=120)
+        if msg.get("type") == "session.ready":
+            break
+    elapsed = time.perf_counter() - t0
+    await comm.disconnect()
+    return elapsed
+
+
+async def _bench_rag_connect(stdout, n: int = 8) -> dict:
+    import statistics
+    import tempfile
+
+    from django.conf import settings
+
+    from voice import consumers, rag_factory
+    from voice.rag_base import run_rag_blocking
+
+    app = consumers.RealtimeVoiceConsumer.as_asgi()
+    old_dir = settings.VOICE_APP.get("CHROMA_DIR", "")
+    old_get = consumers.aget_rag
+    out: dict = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.VOICE_APP["CHROMA_DIR"] = tmp
+        try:
+            # Legacy behaviour: a brand new backend (client + collection) per connection.
+            rag_factory.shutdown_rag()
+            consumers.aget_rag = lambda: run_rag_blocking(rag_factory._build_rag)
+            legacy = [await _connect_to_ready_ms(app) for _ in range(n)]
+            out["per_connection_p50_ms"] = _ms(statistics.median(legacy))
+            out["per_connection_max_ms"] = _ms(max(legacy))
+            out["rss_after_per_connection_mb"] = _rss_mb()
+
+            # Shared registry: first connection is cold unless warmed up, the rest reuse it.
+            consumers.aget_rag = old_get
+            t0 = time.perf_counter()
+            await run_rag_blocking(rag_factory.warm_up_rag)
+            out["warm_up_ms"] = _ms(time.perf_counter() - t0)
+            shared = [await _connect_to_ready_ms(app) for _ in range(n)]
+            out["shared_p50_ms"] = _ms(statistics.median(shared))
+            out["shared_max_ms"] = _ms(max(shared))
+            out["rss_after_shared_mb"] = _rss_mb()
+        finally:
+            consumers.aget_rag = old_get
+            rag_factory.shutdown_rag()
+            settings.VOICE_APP["CHROMA_DIR"] = old_dir
+
+    out["connections_each"] = n
+    return out
+
+
+# ---------------------------------------------------------------------------
+# embed: sentence-transformers (PyTorch) vs ONNX Runtime embedder, CPU only
+# ---------------------------------------------------------------------------
+
+_EMBED_TEXTS = [
+    "He always called me buddy and loved fishing trips.",
+    "We spent every summer at the lake house, just the two of us.",
+    "I miss the way you laughed at your own jokes before you finished them.",
+    "Do you remember the name of the dog we had when I was little?",
+    "My favorite meal was your Sunday pancakes with too much syrup.",
+    "I got the job today and I wish I could tell you in person.",
+    "You taught me how to ride a bike in the church parking lot.",
+    "session_bootstrap",
+] * 4
+
+
+def _embed_worker(backend: str, model_dir: str, quantized: bool, threads: int, q):
+    # Runs in a fresh process so load time and RSS belong to one backend only.
+    from voice.embedders import OnnxMiniLMEmbedder, SentenceTransformerEmbedder
+
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+    if backend == "onnx":
+        emb = OnnxMiniLMEmbedder(model_dir, quantized=quantized, intra_op_threads=threads)
+    else:
+        import torch
+
+        torch.set_num_threads(threads)
+        emb = SentenceTransformerEmbedder()
+    load_s = time.perf_counter() - t0
+    emb.encode(_EMBED_TEXTS[:1])
+
+    singles = []
+    for t in _EMBED_TEXTS[:16]:
+        t1 = time.perf_counter()
+        emb.encode([t])
+        singles.append(time.perf_counter() - t1)
+    singles.sort()
+
+    rounds = 5
+    t2 = time.perf_counter()
+    for _ in range(rounds):
+        emb.encode(_EMBED_TEXTS)
+    batch_s = time.perf_counter() - t2
+
+    q.put(
+        {
+            "load_ms": _ms(load_s),
+            "single_p50_ms": _ms(singles[len(singles) // 2]),
+            "batch_texts_per_sec": round(rounds * len(_EMBED_TEXTS) / max(batch_s, 1e-9), 1),
+            "rss_delta_mb": round(_rss_mb() - rss0, 1),
+            "vectors": emb.encode(_EMBED_TEXTS[:8]).tolist(),
+        }
+    )
+
+
+async def _bench_embed(stdout) -> dict:
+    import multiprocessing as mp
+
+    import numpy as np
+    from django.conf import settings
+
+    model_dir = settings.VOICE_APP.get("ONNX_EMBEDDER_DIR", "")
+    threads = int(settings.VOICE_APP.get("ONNX_EMBEDDER_THREADS", 1) or 1)
+
+    runs = [("sentence_transformers", False)]
+    if os.path.exists(os.path.join(model_dir, "model.onnx")):
+        runs.append(("onnx", False))
+    else:
+        stdout.write(f"  (no ONNX model in {model_dir}; run manage.py voice_export_onnx)")
+    if os.path.exists(os.path.join(model_dir, "model.int8.onnx")):
+        runs.append(("onnx", True))
+
+    ctx = mp.get_context("spawn")
+    results: dict = {}
+    for backend, quantized in runs:
+        q = ctx.Queue()
+        p = ctx.Process(target=_embed_worker, args=(backend, model_dir, quantized, threads, q))
+        p.start()
+        res = await asyncio.to_thread(q.get)
+        p.join()
+        results[backend + ("_int8" if quantized else "")] = res
+
+    ref = np.asarray(results["sentence_transformers"]["vectors"], dtype=np.float32)
+    out: dict = {"threads": threads}
+    for label, res in results.items():
+        vecs = np.asarray(res.pop("vectors"), dtype=np.float32)
+        cos = np.sum(ref * vecs, axis=1) / (np.linalg.norm(ref, axis=1) * np.linalg.norm(vecs, axis=1))
+        res["min_cosine_vs_torch"] = round(float(np.min(cos)), 6)
+        for k, v in res.items():
+            out[f"{label}.{k}"] = v
+    return out
+
+
+# ---------------------------------------------------------------------------
+# realtime_pool: cold connect vs warm-pool claim against a fake Realtime server
+# ---------------------------------------------------------------------------
+
+async def _fake_realtime_server(ws, live: set):
+    live.add(ws)
+    try:
+        await ws.send(json.dumps({"type": "session.created"}))
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg.get("type") == "session.update":
+                await ws.send(json.dumps({"type": "session.updated"}))
+    finally:
+        live.discard(ws)
+
+
+async def _ready_ms(ws, t0: float) -> float:
+    # usable = first event read + a session.update round trip
+    while json.loads(await ws.recv()).get("type") != "session.created":
+        pass
+    await ws.send(json.dumps({"type": "session.update", "session": {}}))
+    while json.loads(await ws.recv()).get("type") != "session.updated":
+        pass
+    return time.perf_counter() - t0
+
+
+async def _bench_realtime_pool(stdout, n: int = 6, handshake_ms: float = 120.0) -> dict:
+    import statistics
+
+    import websockets
+
+    from voice.providers.realtime_pool import RealtimeWSPool, connect_realtime_ws
+
+    live: set = set()
+
+    async def slow_handshake(connection, request):
+        await asyncio.sleep(handshake_ms / 1000.0)  # stands in for TLS + auth to the real API
+
+    out: dict = {"handshake_ms": handshake_ms}
+    async with websockets.serve(lambda ws: _fake_realtime_server(ws, live), "127.0.0.1", 0, process_request=slow_handshake) as server:
+        url = f"ws://127.0.0.1:{list(server.sockets)[0].getsockname()[1]}"
+        connect = lambda: connect_realtime_ws(url, "fake")
+
+        cold = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            ws = await connect()
+            cold.append(await _ready_ms(ws, t0))
+            await ws.close()
+        out["cold_p50_ms"] = _ms(statistics.median(cold))
+
+        pool = RealtimeWSPool(connect=connect, target_size=2, max_idle_s=1.0, health_interval_s=0.2)
+        pool.start()
+        while pool.stats.idle < 2:
+            await asyncio.sleep(0.01)
+
+        warm, warm_flags = [], []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            ws, was_warm = await pool.claim()
+            warm.append(await _ready_ms(ws, t0))
+            warm_flags.append(was_warm)
+            await ws.close()
+            await asyncio.sleep(handshake_ms / 1000.0 + 0.05)  # let the refill catch up
+        out["warm_p50_ms"] = _ms(statistics.median(warm))
+        out["warm_claims"] = f"{sum(warm_flags)}/{n}"
+
+        # server drops every idle socket -> health check must evict + refill
+        for ws in list(live):
+            await ws.close()
+        await asyncio.sleep(0.6)
+        ws, was_warm = await pool.claim()
+        await _ready_ms(ws, time.perf_counter())
+        await ws.close()
+        out["claim_after_server_drop_warm"] = was_warm
+
+        # idle past max_idle_s -> stale eviction
+        await asyncio.sleep(1.5)
+        out.update({f"pool.{k}": v for k, v in pool.snapshot().items()})
+        await pool.close()
+
+    if not out["pool.evicted_dead"] or not out["pool.evicted_stale"]:
+        raise CommandError(f"realtime_pool: expected dead + stale evictions, got {out}")
+    return out
+
+
+# ---------------------------------------------------------------------------
+# opus_encode: per-session CPU + bitrate of the outbound Opus encoder
+# ---------------------------------------------------------------------------
+
+def _speechlike_pcm16(seconds: float, rate: int = 24000) -> bytes:
+    import numpy as np
+
+    t = np.arange(int(seconds * rate)) / float(rate)
+    f0 = 140.0 + 30.0 * np.sin(2 * np.pi * 0.7 * t)  # drifting pitch
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.0 * t) ** 2  # syllable-ish bursts
+    noise = np.random.default_rng(0).standard_normal(t.shape) * 0.05
+    sig = (voiced * envelope + noise) * 6000.0
+    return np.clip(sig, -32768, 32767).astype("<i2").tobytes()
+
+
+async def _bench_opus_encode(stdout, seconds: float = 20.0) -> dict:
+    from voice.audio_codecs import OPUS_FRAME_MS, OpusStreamEncoder
+
+    rate = 24000
+    pcm = _speechlike_pcm16(seconds, rate)
+    frame = 4096  # same PCM frame size the TTS providers yield
+    out: dict = {"audio_sec": seconds, "pcm16_kbps": round(rate * 16 / 1000.0, 1)}
+
+    for frame_ms in OPUS_FRAME_MS:
+        enc = OpusStreamEncoder(sample_rate=rate, frame_ms=frame_ms, bitrate=int(os.getenv("TTS_OPUS_BITRATE", "32000")))
+        packets = 0
+        nbytes = 0
+        c0 = time.process_time()
+        for i in range(0, len(pcm), frame):
+            for pkt in enc.encode(pcm[i : i + frame]):
+                packets += 1
+                nbytes += len(pkt)
+        for pkt in enc.flush():
+            packets += 1
+            nbytes += len(pkt)
+        cpu = time.process_time() - c0
+
+        out[f"opus_{frame_ms}ms.kbps"] = round(nbytes * 8 / seconds / 1000.0, 1)
+        out[f"opus_{frame_ms}ms.packets_per_sec"] = round(packets / seconds, 1)
+        # share of one core while one session is speaking continuously
+        out[f"opus_{frame_ms}ms.cpu_pct_per_session"] = round(cpu / seconds * 100.0, 3)
+
+    enc = OpusStreamEncoder(sample_rate=rate)
+    n = 200
+    spent = 0.0
+    for _ in range(n):
+        enc.encode(pcm[: frame + 100])  # leave a partial frame buffered, like a barge-in mid-reply
+        t0 = time.perf_counter()
+        enc.reset()
+        spent += time.perf_counter() - t0
+    out["reset_us"] = round(spent / n * 1e6, 1)
+    return out
+
+
+async def _bench_mic_decode(stdout, seconds: float = 20.0) -> dict:
+    from voice.audio_codecs import OpusStreamDecoder, OpusStreamEncoder
+    from voice.audio_dsp import StreamResampler
+
+    out: dict = {"audio_sec": seconds}
+    frame_ms = 20  # typical browser/mobile mic chunk
+
+    for rate in (16000, 48000):
+        pcm = _speechlike_pcm16(seconds, rate)
+        step = rate * frame_ms // 1000 * 2
+        rs = StreamResampler(rate, 24000)
+        n_out = 0
+        c0 = time.process_time()
+        for i in range(0, len(pcm), step):
+            n_out += len(rs.process(pcm[i : i + step]))
+        cpu = time.process_time() - c0
+        out[f"pcm{rate // 1000}k.out_sec"] = round(n_out / 2 / 24000, 2)
+        out[f"pcm{rate // 1000}k.cpu_pct_per_session"] = round(cpu / seconds * 100.0, 3)
+
+    pcm24 = _speechlike_pcm16(seconds, 24000)
+    enc = OpusStreamEncoder(sample_rate=24000, frame_ms=frame_ms, bitrate=24000)
+    packets = enc.encode(pcm24) + enc.flush()
+    dec = OpusStreamDecoder(sample_rate=24000)
+    n_out = 0
+    c0 = time.process_time()
+    for pkt in packets:
+        n_out += len(dec.decode(pkt))
+    cpu = time.process_time() - c0
+    out["opus.uplink_kbps"] = round(sum(len(p) for p in packets) * 8 / seconds / 1000.0, 1)
+    out["opus.out_sec"] = round(n_out / 2 / 24000, 2)
+    out["opus.cpu_pct_per_session"] = round(cpu / seconds * 100.0, 3)
+    return out
+
+
+class _CountingWS:
+    """Stands in for the OpenAI socket: counts messages/bytes, keeps nothing."""
+
+    def __init__(self):
+        self.messages = 0
+        self.nbytes = 0
+
+    async def send(self, data):
+        self.messages += 1
+        self.nbytes += len(data)
+
+
+async def _bench_mic_batch(stdout, seconds: float = 30.0, frame_ms: int = 20) -> dict:
+    from voice.consumers import _MIC_FLUSH, RealtimeVoiceConsumer, SessionCfg
+
+    pcm = _speechlike_pcm16(seconds, 24000)
+    step = 24000 * frame_ms // 1000 * 2
+    frames = [pcm[i : i + step] for i in range(0, len(pcm), step)]
+    out: dict = {"audio_sec": seconds, "client_frame_ms": frame_ms}
+
+    for batch_ms in (0, 60, 80, 100):
+        c = RealtimeVoiceConsumer()
+        c.cfg = SessionCfg(mic_batch_ms=batch_ms)
+        c._ws_closed = False
+        ws = c._openai_ws = _CountingWS()
+        c._audio_q = asyncio.Queue()
+        c._mic_unbatched_until = 0.0
+        c._mic_frames_in = c._mic_msgs_out = c._mic_bytes_out = 0
+        c._mic_cpu_s = c._mic_first_ts = 0.0
+        done = asyncio.Event()
+
+        async def _send_json(obj: dict, _done=done):
+            if obj.get("name") == "mic.uplink.stats":
+                _done.set()
+
+        c._send_json = _send_json
+        for fr in frames:
+            c._audio_q.put_nowait(fr)
+        c._audio_q.put_nowait(_MIC_FLUSH)
+
+        c0 = time.process_time()
+        pump = asyncio.create_task(c._pump_audio_to_openai())
+        await done.wait()
+        cpu = time.process_time() - c0
+        pump.cancel()
+        await asyncio.gather(pump, return_exceptions=True)
+
+        key = f"batch_{batch_ms}ms"
+        out[f"{key}.messages_per_sec"] = round(ws.messages / seconds, 1)
+        out[f"{key}.upstream_kbps"] = round(ws.nbytes * 8 / seconds / 1000.0, 1)
+        # b64 + JSON + send for one continuously-talking session, as a share of one core
+        out[f"{key}.cpu_pct_per_session"] = round(cpu / seconds * 100.0, 3)
+    return out
+
+
+def _py_swap_endian16(pcm: bytes) -> bytes:
+    # the per-sample loop tts_elevenlabs used before voice/audio_dsp (reference only)
+    b = bytearray(pcm)
+    for i in range(0, len(b) - 1, 2):
+        b[i], b[i + 1] = b[i + 1], b[i]
+    return bytes(b)
+
+
+def _py_pcm16_stats(pcm: bytes) -> float:
+    # the strided Python loop consumer_helpers used for debug stats (reference only)
+    n = len(pcm) // 2
+    step = max(1, n // 4000)
+    s2 = 0.0
+    count = 0
+    for i in range(0, n, step):
+        v = pcm[2 * i] | (pcm[2 * i + 1] << 8)
+        if v >= 32768:
+            v -= 65536
+        s2 += float(v) * float(v)
+        count += 1
+    return (s2 / max(1, count)) ** 0.5
+
+
+async def _bench_audio_dsp(stdout, iters: int = 2000) -> dict:
+    from voice import audio_dsp as dsp
+
+    rate = 24000
+    pcm = _speechlike_pcm16(2.0, rate)
+    frames = {"20ms": pcm[: rate // 50 * 2], "tts_4096B": pcm[:4096]}
+    out: dict = {"sample_rate": rate}
+
+    def per_call_us(fn, arg, n=iters) -> float:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn(arg)
+        return round((time.perf_counter() - t0) / n * 1e6, 2)
+
+    for label, fr in frames.items():
+        out[f"{label}.rms_us"] = per_call_us(dsp.pcm16_rms, fr)
+        out[f"{label}.dbfs_us"] = per_call_us(dsp.pcm16_dbfs, fr)
+        out[f"{label}.stats_us"] = per_call_us(dsp.pcm16_stats, fr)
+        out[f"{label}.swap_endian_us"] = per_call_us(dsp.swap_endian16, fr)
+        out[f"{label}.gain_us"] = per_call_us(lambda b: dsp.apply_gain(b, 0.8), fr)
+        out[f"{label}.py_swap_endian_us"] = per_call_us(_py_swap_endian16, fr, n=max(1, iters // 20))
+        out[f"{label}.py_stats_us"] = per_call_us(_py_pcm16_stats, fr, n=max(1, iters // 20))
+
+    fr = frames["tts_4096B"]
+    out["tts_4096B.crossfade_5ms_us"] = per_call_us(lambda b: dsp.crossfade_pcm16(b, b), fr)
+    rs = dsp.StreamResampler(16000, rate)
+    out["16k_to_24k_20ms.resample_us"] = per_call_us(rs.process, pcm[: 16000 // 50 * 2])
+    return out
+
+
+class _SlicingFramer:
+    """The bytearray slice + del framer tts_elevenlabs used before the staging-buffer rewrite (reference only)."""
+
+    def __init__(self, frame_bytes: int):
+        self.frame_bytes = frame_bytes
+        self.buf = bytearray()
+        self.remainder = b""
+
+    def push(self, chunk: bytes) -> list:
+        if self.remainder:
+            chunk = self.remainder + chunk
+            self.remainder = b""
+        if len(chunk) % 2:
+            chunk, self.remainder = chunk[:-1], chunk[-1:]
+        self.buf.extend(chunk)
+        out = []
+        while len(self.buf) >= self.frame_bytes:
+            out.append(bytes(self.buf[: self.frame_bytes]))
+            del self.buf[: self.frame_bytes]
+        return out
+
+
+async def _bench_pcm_framer(stdout, seconds: float = 120.0) -> dict:
+    import random
+
+    from voice.providers.tts_elevenlabs import _PCMFramer
+
+    rate = 24000
+    frame_bytes = 4096  # ElevenLabsTTSConfig.frame_bytes
+    pcm = os.urandom(int(seconds * rate) * 2)
+    rng = random.Random(0)
+    patterns = {
+        "http_4096": [4096],  # aiohttp iter_chunked(4096)
+        "ws_b64_msgs": [rng.randrange(3001, 24001, 2) + 1 for _ in range(64)],  # odd-sized decoded WS audio
+        "large_64k": [65536],  # convert endpoint / cache replays
+    }
+    out: dict = {"audio_sec": seconds, "frame_bytes": frame_bytes}
+
+    for name, sizes in patterns.items():
+        chunks = []
+        i = 0
+        j = 0
+        while i < len(pcm):
+            n = sizes[j % len(sizes)]
+            chunks.append(pcm[i : i + n])
+            i += n
+            j += 1
+
+        for label, cls in (("old", _SlicingFramer), ("new", _PCMFramer)):
+            framer = cls(frame_bytes)
+            frames = 0
+            t0 = time.perf_counter()
+            for ch in chunks:
+                frames += len(framer.push(ch))
+            dt = time.perf_counter() - t0
+            out[f"{name}.{label}.frames_per_sec"] = round(frames / dt)
+            out[f"{name}.{label}.x_realtime"] = round(seconds / dt)
+    return out
+
+
+class _CountingClient:
+    """Stands in for the browser socket: counts messages/bytes, keeps nothing."""
+
+    def __init__(self):
+        self.messages = 0
+        self.nbytes = 0
+
+    async def send(self, text_data: str | None = None, bytes_data: bytes | None = None, close: bool = False):
+        self.messages += 1
+        self.nbytes += len(text_data) if text_data is not None else len(bytes_data or b"")
+
+
+async def _bench_silence(stdout, pauses: int = 500) -> dict:
+    from voice.consumers import RealtimeVoiceConsumer
+
+    # TTS_INTER_CHUNK_PAUSE_SEC (0.08) + the cadence segmenter's comma / phrase / sentence pauses
+    durations = [0.08 + p for p in (0.14, 0.18, 0.30)]
+    out: dict = {"pauses": pauses * len(durations), "mean_pause_ms": round(1000 * sum(durations) / len(durations), 1)}
+
+    for mode in ("pcm", "event"):
+        for transport in ("json", "binary"):
+            c = RealtimeVoiceConsumer()
+            client = _CountingClient()
+            c.send = client.send
+            c._ws_closed = False
+            c._audio_gen = 1
+            c._audio_codec = "pcm16"
+            c._audio_binary = transport == "binary"
+            c._audio_seq_gen = -1
+            c._audio_seq = 0
+            c._silence_events = mode == "event"
+
+            c0 = time.process_time()
+            for _ in range(pauses):
+                for d in durations:
+                    await c._send_silence(d, 1, 24000)
+            cpu = time.process_time() - c0
+
+            key = f"{mode}.{transport}"
+            n = pauses * len(durations)
+            out[f"{key}.msgs_per_pause"] = round(client.messages / n, 2)
+            out[f"{key}.bytes_per_pause"] = round(client.nbytes / n)
+            out[f"{key}.cpu_us_per_pause"] = round(cpu / n * 1e6, 1)
+    return out
+
+
+BENCHES: Dict[str, Callable] = {
+    "tts_ws": _bench_tts_ws,
+    "rag_connect": _bench_rag_connect,
+    "embed": _bench_embed,
+    "realtime_pool": _bench_realtime_pool,
+    "opus_encode": _bench_opus_encode,
+    "mic_decode": _bench_mic_decode,
+    "mic_batch": _bench_mic_batch,
+    "audio_dsp": _bench_audio_dsp,
+    "pcm_framer": _bench_pcm_framer,
+    "silence": _bench_silence,
+}
+
+
+class Command(BaseCommand):
+    help = "Run local voice pipeline micro-benchmarks (no API keys needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+        parser.add_argument("--list", action="store_true", help="list available benchmarks")
+
+    def handle(self, *args, **opts):
+        if opts.get("list"):
+            for name in BENCHES:
+                self.stdout.write(name)
+            return
+
+        names = opts.get("names") or list(BENCHES)
+        unknown = [n for n in names if n not in BENCHES]
+        if unknown:
+            raise CommandError(f"unknown benchmark(s): {', '.join(unknown)} (see --list)")
+
+        for name in names:
+            self.stdout.write(f"== {name}")
+            result = asyncio.run(BENCHES[name](self.stdout))
+            for k, v in (result or {}).items():
+                self.stdout.write(f"  {k}: {v}")
@@ -0,0 +1,117 @@
+"""
+Export all-MiniLM-L6-v2 to ONNX for the ONNX Runtime RAG embedder.
+
+    python manage.py voice_export_onnx
+    python manage.py voice_export_onnx --out models/minilm-onnx --quantize
+
+Writes model.onnx (+ model.int8.onnx with --quantize) and tokenizer.json into --out
+(default: VOICE_APP["ONNX_EMBEDDER_DIR"]), then checks the ONNX vectors against the
+sentence-transformers reference. Needs torch/transformers (already in requirements);
+--quantize additionally needs the `onnx` package.
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from voice.embedders import MINILM_HF_ID, OnnxMiniLMEmbedder, SentenceTransformerEmbedder
+
+_CHECK_TEXTS = [
+    "He always called me buddy and loved fishing trips.",
+    "session_bootstrap",
+    "We spent every summer at the lake house, just the two of us.",
+    "I know.",
+]
+
+
+class Command(BaseCommand):
+    help = "Export all-MiniLM-L6-v2 to ONNX (optionally int8-quantized) for EMBEDDER=onnx."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default="", help="output dir (default: VOICE_APP['ONNX_EMBEDDER_DIR'])")
+        parser.add_argument("--quantize", action="store_true", help="also write a dynamic int8 model.int8.onnx")
+        parser.add_argument("--opset", type=int, default=17)
+
+    def handle(self, *args, **opts):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        out = opts.get("out") or settings.VOICE_APP.get("ONNX_EMBEDDER_DIR", "")
+        if not out:
+            raise CommandError("no output dir (pass --out or set ONNX_EMBEDDER_DIR)")
+        os.makedirs(out, exist_ok=True)
+
+        tok = AutoTokenizer.from_pretrained(MINILM_HF_ID)
+        tok.save_pretrained(out)  # fast tokenizer -> tokenizer.json
+        if not os.path.exists(os.path.join(out, "tokenizer.json")):
+            raise CommandError("tokenizer.json was not written (fast tokenizer unavailable?)")
+
+        model = AutoModel.from_pretrained(MINILM_HF_ID).eval()
+
+        class _LastHiddenState(torch.nn.Module):
+            def __init__(self, m):
+                super().__init__()
+                self.m = m
+
+            def forward(self, input_ids, attention_mask, token_type_ids):
+                return self.m(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+
+        dummy = tok(["hello world"], return_tensors="pt", return_token_type_ids=True)
+        names = ["input_ids", "attention_mask", "token_type_ids"]
+        axes = {n: {0: "batch", 1: "seq"} for n in names}
+        axes["last_hidden_state"] = {0: "batch", 1: "seq"}
+
+        fp32_path = os.path.join(out, "model.onnx")
+        opset = int(opts.get("opset") or 17)
+        # torch >= 2.5 defaults to (or offers) the dynamo exporter; keep the TorchScript one,
+        # which handles dynamic_axes for this model.
+        has_dynamo = "dynamo" in inspect.signature(torch.onnx.export).parameters
+        wrapped = _LastHiddenState(model)
+        with torch.no_grad():
+            args_ = tuple(dummy[n] for n in names)
+            if has_dynamo:
+                torch.onnx.export(
+                    wrapped,
+                    args_,
+                    fp32_path,
+                    input_names=names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=axes,
+                    opset_version=opset,
+                    dynamo=False,
+                )
+            else:
+                torch.onnx.export(
+                    wrapped,
+                    args_,
+                    fp32_path,
+                    input_names=names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=axes,
+                    opset_version=opset,
+                )
+        self.stdout.write(f"wrote {fp32_path}")
+
+        if opts.get("quantize"):
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+            except ImportError as e:
+                raise CommandError(f"--quantize needs the `onnx` package (pip install onnx): {e}")
+            int8_path = os.path.join(out, "model.int8.onnx")
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+            self.stdout.write(f"wrote {int8_path}")
+
+        # Compatibility check against the vectors already stored in Chroma.
+        ref = SentenceTransformerEmbedder().encode(_CHECK_TEXTS)
+        for quantized in ([False, True] if opts.get("quantize") else [False]):
+            got = OnnxMiniLMEmbedder(out, quantized=quantized).encode(_CHECK_TEXTS)
+            cos = np.sum(ref * got, axis=1) / (np.linalg.norm(ref, axis=1) * np.linalg.norm(got, axis=1))
+            label = "int8" if quantized else "fp32"
+            self.stdout.write(
+                f"{label}: max_abs_diff={float(np.max(np.abs(ref - got))):.2e} min_cosine={float(np.min(cos)):.6f}"
+            )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Bump when the cached layout or build_system_prompt output changes shape.
+_KEY_VERSION = 2
+
+# Per-process backends only see invalidations from their own process (a LovedOne edited via
+# the REST process never reaches the ASGI workers), so entries there expire quickly.
+_LOCAL_TTL_S = 300
+_SHARED_TTL_S = 86400
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """
+    Everything session.start derives from a LovedOne that doesn't change between sessions:
+    persona block, the session_bootstrap retrieval and the final system text.
+    """
+
+    profile_id: str
+    loved_one_id: int
+    persona_block: str
+    memories_block: str
+    system_text: str
+
+
+def _enabled() -> bool:
+    return os.getenv("PROMPT_CACHE_ENABLED", "1") == "1"
+
+
+def _shared_backend() -> bool:
+    backend = str((getattr(settings, "CACHES", {}).get("default") or {}).get("BACKEND", ""))
+    return not any(k in backend for k in ("locmem", "dummy"))
+
+
+def _ttl_s() -> int:
+    default = _SHARED_TTL_S if _shared_backend() else _LOCAL_TTL_S
+    try:
+        return max(1, int(os.getenv("PROMPT_CACHE_TTL_S", "") or default))
+    except Exception:
+        return default
+
+
+def compiled_prompt_key(loved_one_id: int) -> str:
+    # Keyed by loved one only so LovedOne signals (which don't know the session's profile key)
+    # can invalidate it; profile_id is checked on read.
+    return f"voice:prompt:v{_KEY_VERSION}:{int(loved_one_id)}"
+
+
+async def aget_compiled_prompt(profile_id: str, loved_one_id: int, persona_block: str) -> Optional[CompiledPrompt]:
+    """
+    Cached prompt for this loved one, only if it was compiled from the same persona block
+    the caller just built from the DB: an entry from before a persona edit never matches,
+    even when another process missed the invalidation or re-set it from a stale read.
+    """
+    if not _enabled():
+        return None
+    try:
+        raw = await cache.aget(compiled_prompt_key(loved_one_id))
+    except Exception:
+        return None
+    if not isinstance(raw, dict) or raw.get("profile_id") != str(profile_id):
+        return None
+    if raw.get("persona_block") != persona_block:
+        return None
+    try:
+        return CompiledPrompt(**raw)
+    except TypeError:
+        return None
+
+
+async def aset_compiled_prompt(compiled: CompiledPrompt):
+    if not _enabled():
+        return
+    try:
+        await cache.aset(compiled_prompt_key(compiled.loved_one_id), asdict(compiled), _ttl_s())
+    except Exception:
+        pass
+
+
+def invalidate_compiled_prompt(loved_one_id: int):
+    """Drop the compiled prompt (persona edited / new memory indexed). Safe from sync code."""
+    try:
+        cache.delete(compiled_prompt_key(loved_one_id))
+    except Exception:
+        pass
@@ -159,11 +159,7 @@ def build_system_prompt(ctx: PromptContext) -> str:
         f"{(ctx.memories_block or '(none)').strip()}\n"
     )
 
-def build_reply_instructions(user_text: str) -> str:
-    """
-    Per-turn instruction: adaptive length and consistent “real conversation” flow.
-    """
-    length = classify_reply_length(user_text)
+def _reply_instructions_for(length: str) -> str:
     # Keep this as guidance, but make it voice-friendly.
     if length == ReplyLength.SHORT:
         length_rule = (
@@ -198,3 +194,15 @@ def build_reply_instructions(user_text: str) -> str:
         "\n"
         + length_rule
     )
+
+# The text only depends on the length class, so build all three once at import.
+REPLY_INSTRUCTIONS = {
+    length: _reply_instructions_for(length)
+    for length in (ReplyLength.SHORT, ReplyLength.MEDIUM, ReplyLength.LONG)
+}
+
+def build_reply_instructions(user_text: str) -> str:
+    """
+    Per-turn instruction: adaptive length and consistent “real conversation” flow.
+    """
+    return REPLY_INSTRUCTIONS[classify_reply_length(user_text)]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Dict
+
+import aiohttp
+
+
+# One pooled session per event loop (one loop per ASGI worker process in practice).
+_SESSIONS: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _new_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=_env_int("TTS_HTTP_POOL_LIMIT", 100),
+        limit_per_host=_env_int("TTS_HTTP_POOL_LIMIT_PER_HOST", 32),
+        ttl_dns_cache=_env_int("TTS_HTTP_DNS_TTL_SEC", 300),
+        keepalive_timeout=_env_float("TTS_HTTP_KEEPALIVE_SEC", 30.0),
+        enable_cleanup_closed=True,
+    )
+    # No session-wide timeout: callers pass a per-request ClientTimeout.
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None))
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Shared keep-alive session for outbound TTS HTTP calls.
+    Created on first use (or at ASGI lifespan startup) and reused for every request,
+    so each chunk skips DNS + TCP + TLS setup.
+    """
+    loop = asyncio.get_running_loop()
+
+    for other in [lp for lp in _SESSIONS if lp.is_closed()]:
+        _SESSIONS.pop(other, None)
+
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        session = _new_session()
+        _SESSIONS[loop] = session
+    return session
+
+
+async def close_http_sessions():
+    """
+    Close the pooled session for the running loop (ASGI lifespan shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
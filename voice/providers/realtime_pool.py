@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import websockets
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+async def connect_realtime_ws(url: str, api_key: str):
+    """
+    Open one OpenAI Realtime websocket (header kwarg differs across websockets versions).
+    """
+    headers = {"Authorization": f"Bearer {api_key}"}
+    try:
+        return await websockets.connect(url, additional_headers=headers, max_size=20 * 1024 * 1024)
+    except TypeError:
+        return await websockets.connect(url, extra_headers=headers, max_size=20 * 1024 * 1024)
+
+
+def _is_open(ws) -> bool:
+    return ws is not None and getattr(ws, "close_code", None) is None
+
+
+@dataclass
+class RealtimePoolStats:
+    claims_warm: int = 0
+    claims_cold: int = 0
+    opened: int = 0
+    connect_errors: int = 0
+    evicted_stale: int = 0
+    evicted_dead: int = 0
+    idle: int = 0
+
+
+class RealtimeWSPool:
+    """
+    Per-worker pool of already-connected OpenAI Realtime sockets.
+
+    A background task keeps `target_size` idle sockets open. Sessions `claim()` one at
+    session.start (falling back to a direct connect when the pool is empty); claimed
+    sockets are owned by the session and never come back. Idle sockets older than
+    `max_idle_s` or failing a ping are closed and replaced.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect: Callable[[], Awaitable[Any]],
+        target_size: int = 2,
+        max_idle_s: float = 240.0,
+        health_interval_s: float = 15.0,
+        ping_timeout_s: float = 5.0,
+    ):
+        self._connect = connect
+        self.target_size = max(0, int(target_size))
+        self.max_idle_s = max(1.0, float(max_idle_s))
+        self.health_interval_s = max(0.05, float(health_interval_s))
+        self.ping_timeout_s = max(0.05, float(ping_timeout_s))
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._connecting = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing: set = set()
+        self._closed = False
+        self.stats = RealtimePoolStats()
+
+    def start(self):
+        if self._task is None and not self._closed and self.target_size > 0:
+            self._task = asyncio.create_task(self._refill_loop())
+
+    # ---------------------------
+    # claim
+    # ---------------------------
+
+    def _pop_fresh(self):
+        now = time.monotonic()
+        while self._idle:
+            ws, opened_at = self._idle.popleft()
+            if not _is_open(ws):
+                self.stats.evicted_dead += 1
+                continue
+            if now - opened_at > self.max_idle_s:
+                self.stats.evicted_stale += 1
+                t = asyncio.create_task(self._close_quietly(ws))
+                self._closing.add(t)
+                t.add_done_callback(self._closing.discard)
+                continue
+            return ws
+        return None
+
+    async def claim(self) -> Tuple[Any, bool]:
+        """
+        Returns (websocket, warm). Cold claims connect inline, exactly like the unpooled path.
+        """
+        ws = self._pop_fresh()
+        self.stats.idle = len(self._idle)
+        self._wake.set()
+        if ws is not None:
+            self.stats.claims_warm += 1
+            return ws, True
+
+        self.stats.claims_cold += 1
+        ws = await self._connect()
+        self.stats.opened += 1
+        return ws, False
+
+    # ---------------------------
+    # background refill + health
+    # ---------------------------
+
+    async def _open_one(self):
+        self._connecting += 1
+        try:
+            ws = await self._connect()
+        finally:
+            self._connecting -= 1
+        self.stats.opened += 1
+        if self._closed:
+            await self._close_quietly(ws)
+            return
+        self._idle.append((ws, time.monotonic()))
+        self.stats.idle = len(self._idle)
+
+    async def _health_check(self):
+        now = time.monotonic()
+        keep: Deque[Tuple[Any, float]] = deque()
+        for ws, opened_at in list(self._idle):
+            if not _is_open(ws):
+                self.stats.evicted_dead += 1
+                continue
+            if now - opened_at > self.max_idle_s:
+                self.stats.evicted_stale += 1
+                await self._close_quietly(ws)
+                continue
+            try:
+                pong = await ws.ping()
+                await asyncio.wait_for(pong, timeout=self.ping_timeout_s)
+            except Exception:
+                self.stats.evicted_dead += 1
+                await self._close_quietly(ws)
+                continue
+            keep.append((ws, opened_at))
+        # sockets claimed while we were pinging are no longer ours
+        self._idle = deque(item for item in keep if item in self._idle)
+        self.stats.idle = len(self._idle)
+
+    async def _refill_loop(self):
+        backoff = 0.5
+        last_check = time.monotonic()
+        while not self._closed:
+            try:
+                if time.monotonic() - last_check >= self.health_interval_s:
+                    last_check = time.monotonic()
+                    await self._health_check()
+
+                while not self._closed and len(self._idle) + self._connecting < self.target_size:
+                    await self._open_one()
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats.connect_errors += 1
+                await asyncio.sleep(backoff)
+                backoff = min(30.0, backoff * 2)
+                continue
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.health_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def _close_quietly(ws):
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        self._closed = True
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        while self._idle:
+            ws, _ts = self._idle.popleft()
+            await self._close_quietly(ws)
+        self.stats.idle = 0
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+# One pool per event loop (one loop per ASGI worker process in practice).
+_POOLS: Dict[asyncio.AbstractEventLoop, RealtimeWSPool] = {}
+
+
+def get_realtime_pool() -> Optional[RealtimeWSPool]:
+    """
+    Warm pool for the running loop, built + started on first use (or at ASGI lifespan
+    startup). None when OPENAI_RT_POOL_SIZE=0 or the URL / API key isn't configured.
+    """
+    from django.conf import settings
+
+    size = _env_int("OPENAI_RT_POOL_SIZE", 2)
+    url = settings.VOICE_APP.get("OPENAI_REALTIME_URL") or ""
+    api_key = settings.VOICE_APP.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY", "")
+    if size <= 0 or not url or not api_key:
+        return None
+
+    loop = asyncio.get_running_loop()
+    for other in [lp for lp in _POOLS if lp.is_closed()]:
+        _POOLS.pop(other, None)
+
+    pool = _POOLS.get(loop)
+    if pool is None:
+        pool = RealtimeWSPool(
+            connect=lambda: connect_realtime_ws(url, api_key),
+            target_size=size,
+            max_idle_s=_env_float("OPENAI_RT_POOL_MAX_IDLE_SEC", 240.0),
+            health_interval_s=_env_float("OPENAI_RT_POOL_HEALTH_SEC", 15.0),
+        )
+        _POOLS[loop] = pool
+        pool.start()
+    return pool
+
+
+async def close_realtime_pools():
+    """
+    Close the pool for the running loop (ASGI lifespan shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    pool = _POOLS.pop(loop, None)
+    if pool is not None:
+        await pool.close()
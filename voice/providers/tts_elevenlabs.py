@@ -4,11 +4,14 @@ import asyncio
 import io
 import os
 from dataclasses import dataclass
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Callable, Optional
 
 import aiohttp
 import av
 
+from ..audio_dsp import swap_endian16
+from .http_pool import get_http_session
+
 
 @dataclass
 class ElevenLabsTTSConfig:
@@ -50,21 +53,6 @@ def _has_id3_header(chunk: bytes) -> bool:
     return bool(chunk) and len(chunk) >= 3 and chunk[:3] == b"ID3"
 
 
-def _swap_endian_16bit(pcm: bytes) -> bytes:
-    if len(pcm) < 2:
-        return pcm
-    b = bytearray(pcm)
-    for i in range(0, len(b) - 1, 2):
-        b[i], b[i + 1] = b[i + 1], b[i]
-    return bytes(b)
-
-
-def _ensure_even_length(data: bytes) -> tuple[bytes, bytes]:
-    if len(data) % 2 == 0:
-        return data, b""
-    return data[:-1], data[-1:]
-
-
 def _decode_audio_to_pcm24k_mono_s16le(audio_bytes: bytes) -> bytes:
     bio = io.BytesIO(audio_bytes)
     container = av.open(bio, mode="r")
@@ -131,39 +119,56 @@ def _clamp_0_1(v: float) -> float:
 
 
 class _PCMFramer:
+    """
+    Re-frames a PCM16 byte stream into fixed `frame_bytes` frames.
+
+    Whole frames inside one incoming chunk are emitted as memoryview slices of that
+    (immutable) chunk: no copy, and still valid when a prefetcher / cache holds on to them.
+    Only a frame straddling two chunks is assembled, in a fixed one-frame staging buffer.
+    Bytes are placed by stream position, so odd-sized chunks need no remainder juggling.
+    """
+
     def __init__(self, frame_bytes: int):
-        self.frame_bytes = int(frame_bytes)
-        self.buf = bytearray()
-        self.remainder = b""
+        self.frame_bytes = max(2, int(frame_bytes) & ~1)
+        self._staging = bytearray(self.frame_bytes)
+        self._fill = 0
 
-    def push(self, chunk: bytes) -> list[bytes]:
+    def push(self, chunk: bytes) -> list[bytes | memoryview]:
         if not chunk:
             return []
-
-        if self.remainder:
-            chunk = self.remainder + chunk
-            self.remainder = b""
-
-        chunk, rem = _ensure_even_length(chunk)
-        self.remainder = rem
-
-        if chunk:
-            self.buf.extend(chunk)
-
-        out = []
-        while len(self.buf) >= self.frame_bytes:
-            out.append(bytes(self.buf[: self.frame_bytes]))
-            del self.buf[: self.frame_bytes]
+        if not isinstance(chunk, bytes):
+            chunk = bytes(chunk)  # emitted views must outlive the caller's buffer
+        mv = memoryview(chunk)
+        fb = self.frame_bytes
+        n = len(mv)
+        pos = 0
+        out: list[bytes | memoryview] = []
+
+        if self._fill:
+            take = min(fb - self._fill, n)
+            self._staging[self._fill : self._fill + take] = mv[:take]
+            self._fill += take
+            pos = take
+            if self._fill < fb:
+                return out
+            out.append(bytes(self._staging))
+            self._fill = 0
+
+        whole = pos + (n - pos) // fb * fb
+        for i in range(pos, whole, fb):
+            out.append(mv[i : i + fb])
+
+        rest = n - whole
+        if rest:
+            self._staging[:rest] = mv[whole:]
+            self._fill = rest
         return out
 
     def flush(self) -> tuple[list[bytes], bytes]:
-        out = []
-        while len(self.buf) >= self.frame_bytes:
-            out.append(bytes(self.buf[: self.frame_bytes]))
-            del self.buf[: self.frame_bytes]
-        tail = bytes(self.buf)
-        self.buf.clear()
-        return out, tail
+        # push() already emitted every whole frame; a dangling odd byte is not a sample
+        tail = bytes(self._staging[: self._fill & ~1])
+        self._fill = 0
+        return [], tail
 
 
 class ElevenLabsTTS:
@@ -206,22 +211,32 @@ class ElevenLabsTTS:
 
         return payload
 
-    async def stream_pcm(self, text: str) -> AsyncIterator[bytes]:
+    async def stream_pcm(self, text: str, *, on_fallback: Optional[Callable[[], None]] = None) -> AsyncIterator[bytes | memoryview]:
+        """
+        PCM frames for `text`. If the stream endpoint fails after it already yielded audio, the
+        convert fallback re-renders the whole text and `on_fallback()` is called first, so callers
+        recording the output (TTS cache) know it isn't one clean rendition.
+        Frames may be read-only memoryviews over immutable chunks: `bytes(frame)` before hashing.
+        """
         t = (text or "").strip()
         if not t:
             return
 
+        yielded = False
         try:
             async for b in self._stream_pcm_via_stream_endpoint(t):
+                yielded = True
                 yield b
             return
         except Exception as e:
             _dbg(f"stream endpoint failed -> fallback: {e}")
+            if yielded and on_fallback is not None:
+                on_fallback()
 
         async for b in self._stream_pcm_via_convert_endpoint(t):
             yield b
 
-    async def _stream_pcm_via_stream_endpoint(self, text: str) -> AsyncIterator[bytes]:
+    async def _stream_pcm_via_stream_endpoint(self, text: str) -> AsyncIterator[bytes | memoryview]:
         base_url = os.getenv("ELEVENLABS_BASE_URL", "").rstrip("/")
         url = f"{base_url}/v1/text-to-speech/{self.cfg.voice_id}/stream"
 
@@ -239,24 +254,27 @@ class ElevenLabsTTS:
         timeout = aiohttp.ClientTimeout(total=self.cfg.timeout_sec)
         framer = _PCMFramer(self.cfg.frame_bytes)
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, params=params, headers=headers, json=payload) as resp:
-                if resp.status >= 400:
-                    body = await resp.text()
-                    raise RuntimeError(f"ElevenLabs TTS(stream) failed: {resp.status} {body[:400]}")
+        # Pooled keep-alive session. If this generator is cancelled mid-body (barge-in),
+        # leaving the context releases the response: a half-read connection is closed
+        # instead of being put back in the pool dirty.
+        session = get_http_session()
+        async with session.post(url, params=params, headers=headers, json=payload, timeout=timeout) as resp:
+            if resp.status >= 400:
+                body = await resp.text()
+                raise RuntimeError(f"ElevenLabs TTS(stream) failed: {resp.status} {body[:400]}")
 
-                async for chunk in resp.content.iter_chunked(4096):
-                    for frame in framer.push(chunk):
-                        yield _swap_endian_16bit(frame) if self.swap_endian else frame
-                        await asyncio.sleep(0)
+            async for chunk in resp.content.iter_chunked(4096):
+                for frame in framer.push(chunk):
+                    yield swap_endian16(frame) if self.swap_endian else frame
+                    await asyncio.sleep(0)
 
         frames, tail = framer.flush()
         for frame in frames:
-            yield _swap_endian_16bit(frame) if self.swap_endian else frame
+            yield swap_endian16(frame) if self.swap_endian else frame
         if tail:
-            yield _swap_endian_16bit(tail) if self.swap_endian else tail
+            yield swap_endian16(tail) if self.swap_endian else tail
 
-    async def _stream_pcm_via_convert_endpoint(self, text: str) -> AsyncIterator[bytes]:
+    async def _stream_pcm_via_convert_endpoint(self, text: str) -> AsyncIterator[bytes | memoryview]:
         audio_bytes, is_mpeg, _ = await self._convert_request(text, self.cfg.fallback_output_format)
 
         if is_mpeg or _has_id3_header(audio_bytes[:64]):
@@ -266,7 +284,7 @@ class ElevenLabsTTS:
             pcm = audio_bytes
 
         if self.swap_endian:
-            pcm = _swap_endian_16bit(pcm)
+            pcm = swap_endian16(pcm)
 
         framer = _PCMFramer(self.cfg.frame_bytes)
         for frame in framer.push(pcm):
@@ -296,13 +314,13 @@ class ElevenLabsTTS:
 
         timeout = aiohttp.ClientTimeout(total=self.cfg.timeout_sec)
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, params=params, headers=headers, json=payload) as resp:
-                ctype = (resp.headers.get("Content-Type") or "").lower()
-                if resp.status >= 400:
-                    body = await resp.text()
-                    raise RuntimeError(f"ElevenLabs TTS(convert) failed: {resp.status} {body[:400]}")
-                audio = await resp.read()
+        session = get_http_session()
+        async with session.post(url, params=params, headers=headers, json=payload, timeout=timeout) as resp:
+            ctype = (resp.headers.get("Content-Type") or "").lower()
+            if resp.status >= 400:
+                body = await resp.text()
+                raise RuntimeError(f"ElevenLabs TTS(convert) failed: {resp.status} {body[:400]}")
+            audio = await resp.read()
 
         is_mpeg = ("audio/mpeg" in ctype) or ("mpeg" in ctype)
         return audio, is_mpeg, ctype
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+from typing import AsyncGenerator, AsyncIterator, Callable, List, Optional
+from urllib.parse import urlencode
+
+import websockets
+
+from .tts_elevenlabs import (
+    ElevenLabsTTS,
+    ElevenLabsTTSConfig,
+    _PCMFramer,
+    _dbg,
+)
+from ..audio_dsp import swap_endian16
+
+
+def _ws_base_url(base_url: str) -> str:
+    u = (base_url or "").rstrip("/")
+    if u.startswith("https://"):
+        return "wss://" + u[len("https://") :]
+    if u.startswith("http://"):
+        return "ws://" + u[len("http://") :]
+    return u
+
+
+class ElevenLabsWSTTS(ElevenLabsTTS):
+    """
+    ElevenLabs input-streaming TTS over one WebSocket per reply.
+
+    Text fragments are pushed as they arrive from the LLM (send_text); PCM comes back
+    on the same socket and is re-framed with the same _PCMFramer as the HTTP provider.
+      - finish(): end of turn -> flush what is buffered server-side, then EOS
+      - abort():  barge-in    -> drop the socket immediately
+
+    Usage:
+        tts = ElevenLabsWSTTS(cfg)
+        await tts.open()
+        ... await tts.send_text("Hello there, ") ...
+        await tts.finish()
+        async for frame in tts.frames(): ...
+        await tts.abort()  # always; no-op once closed
+    """
+
+    def __init__(
+        self,
+        cfg: ElevenLabsTTSConfig,
+        *,
+        swap_endian: bool = False,
+        chunk_length_schedule: Optional[List[int]] = None,
+    ):
+        super().__init__(cfg, swap_endian=swap_endian)
+        self.chunk_length_schedule = chunk_length_schedule
+        self._ws = None
+        self._finished = False
+
+    def _url(self) -> str:
+        base_url = _ws_base_url(os.getenv("ELEVENLABS_BASE_URL", ""))
+        params = {"output_format": self.cfg.stream_output_format}
+        if self.cfg.model_id:
+            params["model_id"] = self.cfg.model_id
+        return f"{base_url}/v1/text-to-speech/{self.cfg.voice_id}/stream-input?{urlencode(params)}"
+
+    async def open(self):
+        if self._ws is not None:
+            return
+
+        headers = {"xi-api-key": self.cfg.api_key}
+        try:
+            self._ws = await websockets.connect(self._url(), additional_headers=headers, max_size=16 * 1024 * 1024)
+        except TypeError:
+            self._ws = await websockets.connect(self._url(), extra_headers=headers, max_size=16 * 1024 * 1024)
+
+        # Protocol: the first message initializes the stream and must carry a single space.
+        init: dict = {"text": " ", "voice_settings": self._voice_settings_payload()}
+        if self.chunk_length_schedule:
+            init["generation_config"] = {"chunk_length_schedule": list(self.chunk_length_schedule)}
+        await self._ws.send(json.dumps(init))
+
+    async def send_text(self, text: str, *, flush: bool = False):
+        if self._ws is None or self._finished:
+            return
+        t = text or ""
+        if not t.strip():
+            return
+        # The server wants fragments to end with a space so words don't get glued.
+        if not t.endswith(" "):
+            t += " "
+        msg: dict = {"text": t}
+        if flush:
+            msg["flush"] = True
+        await self._ws.send(json.dumps(msg))
+
+    async def finish(self):
+        """
+        End of turn: force generation of anything still buffered, then close the input.
+        """
+        if self._ws is None or self._finished:
+            return
+        self._finished = True
+        await self._ws.send(json.dumps({"text": " ", "flush": True}))
+        await self._ws.send(json.dumps({"text": ""}))
+
+    async def abort(self):
+        """
+        Barge-in / teardown: drop the socket without waiting for pending audio.
+        """
+        ws, self._ws = self._ws, None
+        self._finished = True
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def frames(self) -> AsyncGenerator[bytes | memoryview, None]:
+        """
+        Yield fixed-size PCM frames until the server reports isFinal or closes the socket.
+        """
+        ws = self._ws
+        if ws is None:
+            return
+
+        framer = _PCMFramer(self.cfg.frame_bytes)
+        try:
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except Exception:
+                    _dbg("ws: non-json message ignored")
+                    continue
+
+                if msg.get("error"):
+                    raise RuntimeError(f"ElevenLabs TTS(ws) failed: {str(msg.get('message') or msg.get('error'))[:400]}")
+
+                b64 = msg.get("audio")
+                if b64:
+                    for frame in framer.push(base64.b64decode(b64)):
+                        yield swap_endian16(frame) if self.swap_endian else frame
+                        await asyncio.sleep(0)
+
+                if msg.get("isFinal"):
+                    break
+        except websockets.ConnectionClosedOK:
+            pass
+
+        frames, tail = framer.flush()
+        for frame in frames:
+            yield swap_endian16(frame) if self.swap_endian else frame
+        if tail:
+            yield swap_endian16(tail) if self.swap_endian else tail
+
+    async def stream_pcm(self, text: str, *, on_fallback: Optional[Callable[[], None]] = None) -> AsyncIterator[bytes | memoryview]:
+        """
+        One-shot compatibility with ElevenLabsTTS.stream_pcm (one socket per call).
+        There is no fallback path here, so `on_fallback` is never called.
+        """
+        t = (text or "").strip()
+        if not t:
+            return
+        try:
+            await self.open()
+            await self.send_text(t)
+            await self.finish()
+            async for frame in self.frames():
+                yield frame
+        finally:
+            await self.abort()
+            self._finished = False
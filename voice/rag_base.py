@@ -1,4 +1,9 @@
 from __future__ import annotations
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from abc import ABC, abstractmethod
@@ -10,6 +15,60 @@ class RAGResult:
     metadatas: List[Dict[str, Any]]
 
 
+# Embedding + vector search are blocking (model encode + store I/O). They run on a small
+# dedicated pool so one session's retrieval never stalls every other socket on the loop.
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+_PENDING: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except Exception:
+        return default
+
+
+def _rag_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_env_int("RAG_EXECUTOR_WORKERS", 2),
+                    thread_name_prefix="rag",
+                )
+    return _EXECUTOR
+
+
+def _pending_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _PENDING.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(_env_int("RAG_EXECUTOR_MAX_PENDING", 64))
+        _PENDING[loop] = sem
+    return sem
+
+
+async def run_rag_blocking(fn, /, *args, **kwargs):
+    """
+    Run a blocking RAG call on the bounded RAG executor.
+    At most RAG_EXECUTOR_MAX_PENDING calls per loop are queued; extra callers wait.
+    """
+    async with _pending_slots():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_rag_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_rag_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        ex, _EXECUTOR = _EXECUTOR, None
+    if ex is not None:
+        ex.shutdown(wait=False, cancel_futures=True)
+    _PENDING.clear()
+
+
 class RAGBase(ABC):
     @abstractmethod
     def add_memory(
@@ -32,3 +91,36 @@ class RAGBase(ABC):
         k: int = 5,
     ) -> RAGResult:
         raise NotImplementedError
+
+    def add_memories(self, *, items, **kwargs) -> List[str]:
+        """Bulk insert; backends that can batch should override this."""
+        inserted: List[str] = []
+        for item in items:
+            inserted.extend(self.add_memory(**item, **kwargs))
+        return inserted
+
+    def load_index(self, *, profile_id: str, loved_one_id: int) -> int:
+        """Pull one loved one's vectors into an in-process hot index (optional). Returns rows loaded."""
+        return 0
+
+    def warm_up(self):
+        """Load models / open stores ahead of the first request (optional)."""
+        return None
+
+    def close(self):
+        """Release backend resources on shutdown (optional)."""
+        return None
+
+    # Async variants for the event loop (consumers). Same arguments as the sync methods.
+
+    async def aadd_memory(self, **kwargs) -> List[str]:
+        return await run_rag_blocking(self.add_memory, **kwargs)
+
+    async def aadd_memories(self, **kwargs) -> List[str]:
+        return await run_rag_blocking(self.add_memories, **kwargs)
+
+    async def aload_index(self, **kwargs) -> int:
+        return await run_rag_blocking(self.load_index, **kwargs)
+
+    async def aquery(self, **kwargs) -> RAGResult:
+        return await run_rag_blocking(self.query, **kwargs)
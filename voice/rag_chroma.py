@@ -1,19 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import hashlib
 import re
+import threading
 
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 
+from .embedders import EmbedderBase, get_embedder
+from .prompt_cache import invalidate_compiled_prompt
 from .rag_base import RAGBase, RAGResult
+from .rag_index import build_vector_index_cache
 
 
 class ChromaRAG(RAGBase):
-    _EMBEDDER: Optional[SentenceTransformer] = None
 
     def __init__(self, persist_dir: str):
         self.client = chromadb.PersistentClient(
@@ -22,12 +24,83 @@ class ChromaRAG(RAGBase):
         )
         self.collection = self.client.get_or_create_collection(name="memories")
         self.embedder = self._get_embedder()
+        # hot tier: per-loved-one NumPy matrices, loaded on session.start (None = disabled)
+        self.index = build_vector_index_cache()
+        self._closed = False
+        # per (profile, loved one): writes started/finished and writes in flight, so load_index
+        # can tell whether an add_memory raced its collection.get -> index.put window
+        self._write_lock = threading.Lock()
+        self._write_gen: Dict[Tuple[str, int], int] = {}
+        self._writes_inflight: Dict[Tuple[str, int], int] = {}
 
-    @classmethod
-    def _get_embedder(cls) -> SentenceTransformer:
-        if cls._EMBEDDER is None:
-            cls._EMBEDDER = SentenceTransformer("all-MiniLM-L6-v2")
-        return cls._EMBEDDER
+    @staticmethod
+    def _get_embedder() -> EmbedderBase:
+        # backend chosen by VOICE_APP["EMBEDDER"] (sentence_transformers | onnx)
+        return get_embedder()
+
+    def _ensure_open(self):
+        if self._closed:
+            raise RuntimeError("ChromaRAG is closed (shutdown_rag() ran); get the current backend from get_rag()")
+
+    def warm_up(self):
+        self._ensure_open()
+        # First encode pays for lazy weight loading / kernel init; do it before any user waits.
+        self.embedder.encode(["warm up"])
+        self.collection.count()
+
+    def _write_state(self, owner: Tuple[str, int]) -> Tuple[int, int]:
+        with self._write_lock:
+            return self._write_gen.get(owner, 0), self._writes_inflight.get(owner, 0)
+
+    def _begin_write(self, owners: Iterable[Tuple[str, int]]):
+        with self._write_lock:
+            for o in owners:
+                self._write_gen[o] = self._write_gen.get(o, 0) + 1
+                self._writes_inflight[o] = self._writes_inflight.get(o, 0) + 1
+
+    def _end_write(self, owners: Iterable[Tuple[str, int]]):
+        with self._write_lock:
+            for o in owners:
+                self._write_gen[o] = self._write_gen.get(o, 0) + 1
+                n = self._writes_inflight.get(o, 0) - 1
+                if n > 0:
+                    self._writes_inflight[o] = n
+                else:
+                    self._writes_inflight.pop(o, None)
+
+    def load_index(self, *, profile_id: str, loved_one_id: int, max_attempts: int = 3) -> int:
+        self._ensure_open()
+        if self.index is None:
+            return 0
+        owner = (str(profile_id), int(loved_one_id))
+        for _ in range(max(1, max_attempts)):
+            gen0, _ = self._write_state(owner)
+            res = self.collection.get(
+                where=self._where(profile_id, loved_one_id),
+                include=["embeddings", "documents", "metadatas"],
+            )
+            ids = list(res.get("ids") or [])
+            embs = res.get("embeddings")
+            self.index.put(
+                profile_id,
+                loved_one_id,
+                ids=ids,
+                docs=[d or "" for d in (res.get("documents") or [])],
+                metadatas=[dict(m or {}) for m in (res.get("metadatas") or [])],
+                embeddings=embs if embs is not None else [],
+            )
+            # An insert overlapping get -> put may be missing from the snapshot (its append hit no
+            # entry / was replaced by put) or appended twice: only a quiet window counts.
+            if self._write_state(owner) == (gen0, 0):
+                return len(ids)
+        # writes keep landing: leave this loved one to Chroma until the next load
+        self.index.invalidate(profile_id, loved_one_id)
+        return 0
+
+    def close(self):
+        self._closed = True
+        if self.index is not None:
+            self.index.clear()
 
     @staticmethod
     def _norm_text(s: str) -> str:
@@ -72,7 +145,12 @@ class ChromaRAG(RAGBase):
 
         return chunks
 
-    def add_memory(
+    @staticmethod
+    def _where(profile_id: str, loved_one_id: int, *extra: Dict[str, Any]) -> Dict[str, Any]:
+        # Chroma wants exactly one operator per where-clause, so combine filters with $and.
+        return {"$and": [{"profile_id": profile_id}, {"loved_one_id": int(loved_one_id)}, *extra]}
+
+    def _prepare_rows(
         self,
         *,
         profile_id: str,
@@ -83,54 +161,174 @@ class ChromaRAG(RAGBase):
         max_chars: int = 900,
         overlap_chars: int = 140,
         dedup_exact: bool = True,
-    ) -> List[str]:
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Chunk + normalize one memory into (id, document, metadata) rows; no store access."""
         text_n = self._norm_text(text)
         if not text_n:
             return []
 
         parts = self._chunk_text(text_n, max_chars=max_chars, overlap_chars=overlap_chars) if chunk_long else [text_n]
-        inserted: List[str] = []
+        rows: List[Tuple[str, str, Dict[str, Any]]] = []
 
         for i, part in enumerate(parts):
             part_n = self._norm_text(part)
             if not part_n:
                 continue
 
-            h = self._text_hash(profile_id, loved_one_id, part_n) if dedup_exact else ""
-
-            # dedup check
-            if dedup_exact:
-                try:
-                    existing = self.collection.get(
-                        where={"profile_id": profile_id, "loved_one_id": int(loved_one_id), "hash": h},
-                        include=["ids"],
-                    )
-                    if existing and existing.get("ids"):
-                        continue
-                except Exception:
-                    pass
-
             vid = f"{memory_id}:{i}" if len(parts) > 1 else str(memory_id)
-            emb = self.embedder.encode([part_n])[0].tolist()
-
             meta: Dict[str, Any] = {
                 "profile_id": profile_id,
                 "loved_one_id": int(loved_one_id),
             }
             if dedup_exact:
-                meta["hash"] = h
+                meta["hash"] = self._text_hash(profile_id, loved_one_id, part_n)
             if len(parts) > 1:
                 meta["chunk_index"] = i
                 meta["chunk_total"] = len(parts)
+            rows.append((vid, part_n, meta))
+
+        return rows
+
+    def _existing_hashes(self, profile_id: str, loved_one_id: int, hashes: List[str]) -> set:
+        """One store lookup for every candidate chunk hash of a (profile, loved one)."""
+        if not hashes:
+            return set()
+        try:
+            existing = self.collection.get(
+                where=self._where(profile_id, loved_one_id, {"hash": {"$in": list(hashes)}}),
+                include=["metadatas"],
+            )
+        except Exception:
+            return set()
+        return {h for m in (existing.get("metadatas") or []) if isinstance(h := (m or {}).get("hash"), str)}
+
+    def _dedup_rows(self, rows: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        by_owner: Dict[Tuple[str, int], List[str]] = {}
+        for _vid, _doc, meta in rows:
+            h = meta.get("hash")
+            if h:
+                by_owner.setdefault((meta["profile_id"], meta["loved_one_id"]), []).append(h)
+
+        seen: set = set()
+        for (profile_id, loved_one_id), hashes in by_owner.items():
+            seen |= self._existing_hashes(profile_id, loved_one_id, hashes)
+
+        kept: List[Tuple[str, str, Dict[str, Any]]] = []
+        for row in rows:
+            h = row[2].get("hash")
+            if h:
+                if h in seen:
+                    continue
+                seen.add(h)  # identical chunks within the same batch
+            kept.append(row)
+        return kept
+
+    def _insert_rows(self, rows: List[Tuple[str, str, Dict[str, Any]]]) -> List[str]:
+        if not rows:
+            return []
+        ids = [r[0] for r in rows]
+        docs = [r[1] for r in rows]
+        embs = self.embedder.encode(docs)
+
+        by_owner: Dict[Tuple[str, int], List[int]] = {}
+        for j, r in enumerate(rows):
+            by_owner.setdefault((str(r[2]["profile_id"]), int(r[2]["loved_one_id"])), []).append(j)
 
+        self._begin_write(by_owner)
+        try:
             self.collection.add(
-                ids=[vid],
-                embeddings=[emb],
-                documents=[part_n],
-                metadatas=[meta],
+                ids=ids,
+                embeddings=[e.tolist() for e in embs],
+                documents=docs,
+                metadatas=[r[2] for r in rows],
+            )
+            for (profile_id, loved_one_id), js in by_owner.items():
+                # bootstrap memories baked into the compiled system prompt may have changed
+                invalidate_compiled_prompt(loved_one_id)
+                if self.index is not None:
+                    self.index.append(
+                        profile_id,
+                        loved_one_id,
+                        ids=[ids[j] for j in js],
+                        docs=[docs[j] for j in js],
+                        metadatas=[rows[j][2] for j in js],
+                        embeddings=embs[js],
+                    )
+        finally:
+            self._end_write(by_owner)
+        return ids
+
+    def add_memory(
+        self,
+        *,
+        profile_id: str,
+        loved_one_id: int,
+        text: str,
+        memory_id: str,
+        chunk_long: bool = True,
+        max_chars: int = 900,
+        overlap_chars: int = 140,
+        dedup_exact: bool = True,
+    ) -> List[str]:
+        self._ensure_open()
+        rows = self._prepare_rows(
+            profile_id=profile_id,
+            loved_one_id=loved_one_id,
+            text=text,
+            memory_id=memory_id,
+            chunk_long=chunk_long,
+            max_chars=max_chars,
+            overlap_chars=overlap_chars,
+            dedup_exact=dedup_exact,
+        )
+        if dedup_exact:
+            rows = self._dedup_rows(rows)
+
+        # one dedup lookup, one batched encode, one insert
+        return self._insert_rows(rows)
+
+    def add_memories(
+        self,
+        *,
+        items: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        chunk_long: bool = True,
+        max_chars: int = 900,
+        overlap_chars: int = 140,
+        dedup_exact: bool = True,
+    ) -> List[str]:
+        """
+        Bulk insert for imports / reindexing. `items` are dicts with
+        profile_id, loved_one_id, text, memory_id. Rows are deduped once per
+        (profile, loved one), then encoded + inserted `batch_size` chunks at a time.
+        """
+        self._ensure_open()
+        rows: List[Tuple[str, str, Dict[str, Any]]] = []
+        for item in items:
+            rows.extend(
+                self._prepare_rows(
+                    profile_id=item["profile_id"],
+                    loved_one_id=item["loved_one_id"],
+                    text=item.get("text", ""),
+                    memory_id=item["memory_id"],
+                    chunk_long=chunk_long,
+                    max_chars=max_chars,
+                    overlap_chars=overlap_chars,
+                    dedup_exact=dedup_exact,
+                )
             )
-            inserted.append(vid)
+        if dedup_exact:
+            rows = self._dedup_rows(rows)
+
+        step = max(1, int(batch_size))
+        try:
+            step = min(step, int(self.client.get_max_batch_size()))
+        except Exception:
+            pass
 
+        inserted: List[str] = []
+        for i in range(0, len(rows), step):
+            inserted.extend(self._insert_rows(rows[i : i + step]))
         return inserted
 
     @staticmethod
@@ -159,22 +357,28 @@ class ChromaRAG(RAGBase):
         diversity_jaccard_threshold: float = 0.72,
         candidate_k: Optional[int] = None,
     ) -> RAGResult:
+        self._ensure_open()
         q = self._norm_text(query_text or "")
         if not q:
             return RAGResult(docs=[], metadatas=[])
 
         candidate_k = candidate_k or max(12, k * 3)
 
-        emb = self.embedder.encode([q])[0].tolist()
-        res = self.collection.query(
-            query_embeddings=[emb],
-            n_results=candidate_k,
-            where={"profile_id": profile_id, "loved_one_id": int(loved_one_id)},
-            include=["documents", "metadatas"],
-        )
-
-        docs_all = res.get("documents", [[]])[0] if res else []
-        metas_all = res.get("metadatas", [[]])[0] if res else []
+        q_emb = self.embedder.encode([q])[0]
+        idx = self.index.get(profile_id, loved_one_id) if self.index is not None else None
+        if idx is not None:
+            top = idx.search(q_emb, candidate_k)
+            docs_all = [idx.docs[i] for i in top]
+            metas_all = [idx.metadatas[i] for i in top]
+        else:
+            res = self.collection.query(
+                query_embeddings=[q_emb.tolist()],
+                n_results=candidate_k,
+                where=self._where(profile_id, loved_one_id),
+                include=["documents", "metadatas"],
+            )
+            docs_all = (res.get("documents") or [[]])[0] if res else []
+            metas_all = (res.get("metadatas") or [[]])[0] if res else []
 
         picked_docs: List[str] = []
         picked_metas: List[Dict[str, Any]] = []
@@ -196,7 +400,7 @@ class ChromaRAG(RAGBase):
                 picked_token_sets.append(dtoks)
 
             picked_docs.append(d)
-            picked_metas.append(meta or {})
+            picked_metas.append(dict(meta or {}))
             total_chars += len(d)
 
             if len(picked_docs) >= k:
@@ -1,10 +1,19 @@
+import threading
+from typing import Optional
+
 from django.conf import settings
 
-from .rag_base import RAGBase
+from .rag_base import RAGBase, run_rag_blocking
 from .rag_chroma import ChromaRAG
 
 
-def get_rag() -> RAGBase:
+# One shared backend per process: the Chroma client, collection handle and embedder
+# are expensive to build and safe to share between sessions.
+_RAG: Optional[RAGBase] = None
+_RAG_LOCK = threading.Lock()
+
+
+def _build_rag() -> RAGBase:
     provider = (settings.VOICE_APP.get("VECTOR_DB") or "chroma").lower()
 
     if provider == "chroma":
@@ -16,3 +25,44 @@ def get_rag() -> RAGBase:
     #     return PineconeRAG(...)
 
     raise ValueError(f"Unsupported VECTOR_DB provider: {provider}")
+
+
+def get_rag() -> RAGBase:
+    """
+    Process-wide RAG backend, built lazily on first use (thread-safe).
+    """
+    global _RAG
+    rag = _RAG
+    if rag is None:
+        with _RAG_LOCK:
+            if _RAG is None:
+                _RAG = _build_rag()
+            rag = _RAG
+    return rag
+
+
+async def aget_rag() -> RAGBase:
+    """
+    Async get_rag(): the first (cold) build runs on the RAG executor instead of the loop.
+    """
+    rag = _RAG
+    if rag is not None:
+        return rag
+    return await run_rag_blocking(get_rag)
+
+
+def warm_up_rag() -> RAGBase:
+    """
+    Build the shared backend and load model weights ahead of the first session.
+    """
+    rag = get_rag()
+    rag.warm_up()
+    return rag
+
+
+def shutdown_rag():
+    global _RAG
+    with _RAG_LOCK:
+        rag, _RAG = _RAG, None
+    if rag is not None:
+        rag.close()
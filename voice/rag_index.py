@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+IndexKey = Tuple[str, int]
+
+
+@dataclass
+class VectorIndexStats:
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    appends: int = 0
+    evictions: int = 0
+    bytes_used: int = 0
+    entries: int = 0
+
+
+@dataclass
+class LovedOneIndex:
+    """
+    One loved one's memory chunks as a contiguous (n, dim) matrix of unit vectors.
+    Treated as immutable: appends build a new instance, so readers never need the lock.
+    """
+
+    ids: List[str]
+    docs: List[str]
+    metadatas: List[Dict[str, Any]]
+    matrix: np.ndarray
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes) + sum(len(d) for d in self.docs)
+
+    def search(self, query: np.ndarray, n: int) -> List[int]:
+        """Row indices of the `n` nearest chunks, best first."""
+        rows = self.matrix.shape[0]
+        if rows == 0 or n <= 0:
+            return []
+        q = _unit_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0].astype(self.matrix.dtype)
+        scores = self.matrix @ q
+        n = min(n, rows)
+        if n < rows:
+            top = np.argpartition(-scores, n - 1)[:n]
+        else:
+            top = np.arange(rows)
+        return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    # Chroma ranks by L2 distance; on unit vectors that is the same order as dot product.
+    m = np.asarray(m, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.clip(norms, 1e-12, None)
+
+
+class VectorIndexCache:
+    """
+    Hot tier for retrieval: LovedOneIndex per (profile_id, loved_one_id), LRU-evicted
+    under a global byte budget. Chroma stays the source of truth; a missing or expired
+    entry just means the caller queries Chroma.
+    """
+
+    def __init__(self, *, max_bytes: int, dtype: str = "float32", ttl_s: float = 0.0):
+        self.max_bytes = max(0, int(max_bytes))
+        self.dtype = np.float16 if str(dtype).lower() in ("float16", "fp16", "f16") else np.float32
+        self.ttl_s = max(0.0, float(ttl_s))
+
+        self._entries: "OrderedDict[IndexKey, LovedOneIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = VectorIndexStats()
+
+    @staticmethod
+    def key(profile_id: str, loved_one_id: int) -> IndexKey:
+        return (str(profile_id), int(loved_one_id))
+
+    def _expired(self, idx: LovedOneIndex) -> bool:
+        return bool(self.ttl_s) and (time.monotonic() - idx.loaded_at) > self.ttl_s
+
+    def get(self, profile_id: str, loved_one_id: int) -> Optional[LovedOneIndex]:
+        k = self.key(profile_id, loved_one_id)
+        with self._lock:
+            idx = self._entries.get(k)
+            if idx is not None and self._expired(idx):
+                self._drop(k)
+                idx = None
+            if idx is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(k)
+            self.stats.hits += 1
+            return idx
+
+    def _drop(self, k: IndexKey):
+        old = self._entries.pop(k, None)
+        if old is not None:
+            self.stats.bytes_used -= old.nbytes
+        self.stats.entries = len(self._entries)
+
+    def _store(self, k: IndexKey, idx: LovedOneIndex):
+        # caller holds the lock
+        self._drop(k)
+        if idx.nbytes > self.max_bytes:
+            return
+        self._entries[k] = idx
+        self.stats.bytes_used += idx.nbytes
+        while self.stats.bytes_used > self.max_bytes and self._entries:
+            _k, ev = self._entries.popitem(last=False)
+            self.stats.bytes_used -= ev.nbytes
+            self.stats.evictions += 1
+        self.stats.entries = len(self._entries)
+
+    def put(
+        self,
+        profile_id: str,
+        loved_one_id: int,
+        *,
+        ids: Sequence[str],
+        docs: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Any,
+    ) -> LovedOneIndex:
+        """Replace the whole entry (used when loading from the store)."""
+        emb = np.asarray(embeddings if len(ids) else np.zeros((0, 0)), dtype=np.float32)
+        if emb.ndim != 2:
+            emb = emb.reshape(len(ids), -1)
+        idx = LovedOneIndex(
+            ids=list(ids),
+            docs=list(docs),
+            metadatas=[m or {} for m in metadatas],
+            matrix=np.ascontiguousarray(_unit_rows(emb).astype(self.dtype)),
+        )
+        with self._lock:
+            self._store(self.key(profile_id, loved_one_id), idx)
+            self.stats.loads += 1
+        return idx
+
+    def append(
+        self,
+        profile_id: str,
+        loved_one_id: int,
+        *,
+        ids: Sequence[str],
+        docs: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Any,
+    ):
+        """Add freshly inserted rows to a loaded entry; no-op if the loved one isn't cached."""
+        if not ids:
+            return
+        k = self.key(profile_id, loved_one_id)
+        new = np.ascontiguousarray(_unit_rows(np.asarray(embeddings, dtype=np.float32)).astype(self.dtype))
+        with self._lock:
+            cur = self._entries.get(k)
+            if cur is None:
+                return
+            if cur.matrix.shape[0] and cur.matrix.shape[1] != new.shape[1]:
+                self._drop(k)  # dimension changed (embedder swap) -> reload from the store
+                return
+            matrix = new if cur.matrix.shape[0] == 0 else np.concatenate([cur.matrix, new], axis=0)
+            idx = LovedOneIndex(
+                ids=cur.ids + list(ids),
+                docs=cur.docs + list(docs),
+                metadatas=cur.metadatas + [m or {} for m in metadatas],
+                matrix=matrix,
+                loaded_at=cur.loaded_at,
+            )
+            self._store(k, idx)
+            self.stats.appends += 1
+
+    def invalidate(self, profile_id: str, loved_one_id: int):
+        with self._lock:
+            self._drop(self.key(profile_id, loved_one_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats.bytes_used = 0
+            self.stats.entries = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return asdict(self.stats)
+
+
+def build_vector_index_cache() -> Optional[VectorIndexCache]:
+    """
+    Built from env (RAG_INDEX_ENABLED / RAG_INDEX_MAX_MB / RAG_INDEX_DTYPE / RAG_INDEX_TTL_S).
+    Returns None when disabled.
+    """
+    if os.getenv("RAG_INDEX_ENABLED", "1") != "1":
+        return None
+    try:
+        max_mb = float(os.getenv("RAG_INDEX_MAX_MB", "128"))
+    except Exception:
+        max_mb = 128.0
+    try:
+        ttl_s = float(os.getenv("RAG_INDEX_TTL_S", "300"))
+    except Exception:
+        ttl_s = 300.0
+    return VectorIndexCache(
+        max_bytes=int(max_mb * 1024 * 1024),
+        dtype=os.getenv("RAG_INDEX_DTYPE", "float32"),
+        ttl_s=ttl_s,
+    )
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LovedOne
+from .prompt_cache import invalidate_compiled_prompt
+
+
+@receiver(post_save, sender=LovedOne)
+@receiver(post_delete, sender=LovedOne)
+def invalidate_loved_one_prompt(sender, instance, **kwargs):
+    # persona fields / core_memories feed the compiled system prompt
+    invalidate_compiled_prompt(instance.pk)
@@ -0,0 +1,33 @@
+"""
+In-process fakes shared by the voice tests and `manage.py voice_bench` (no network, no API keys).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+
+
+async def fake_eleven_stream_input(ws, pcm_per_fragment: bytes, received: list | None = None):
+    """
+    Minimal ElevenLabs stream-input server: canned PCM per non-empty text fragment,
+    isFinal on EOS (`{"text": ""}`). Every message is appended to `received` when given.
+    """
+    init = json.loads(await ws.recv())
+    if received is not None:
+        received.append(init)
+    assert init.get("text") == " ", "first message must initialize the stream"
+
+    async for raw in ws:
+        msg = json.loads(raw)
+        if received is not None:
+            received.append(msg)
+        text = msg.get("text", None)
+        if text == "":
+            await ws.send(json.dumps({"isFinal": True}))
+            return
+        if (text or "").strip():
+            # canned audio, split in two so the client framer has to re-assemble
+            half = len(pcm_per_fragment) // 2 + 1
+            for part in (pcm_per_fragment[:half], pcm_per_fragment[half:]):
+                await ws.send(json.dumps({"audio": base64.b64encode(part).decode("ascii"), "isFinal": None}))
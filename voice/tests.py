@@ -1,3 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from unittest import mock
+
+import websockets
 from django.test import TestCase
 
-# Create your tests here.
+from voice.providers.tts_elevenlabs import ElevenLabsTTSConfig
+from voice.providers.tts_elevenlabs_ws import ElevenLabsWSTTS
+from voice.testing import fake_eleven_stream_input
+
+
+class ElevenLabsWSTTSTests(TestCase):
+    pcm = b"\x01\x00" * 12000  # 0.5s @ 24kHz per fragment
+    fragments = ["Hey, ", "it's really good ", "to hear from you. ", "How was today?"]
+
+    async def _serve(self, received: list, closed: asyncio.Event):
+        async def handler(ws):
+            try:
+                await fake_eleven_stream_input(ws, self.pcm, received)
+            except websockets.ConnectionClosed:
+                pass
+            finally:
+                closed.set()
+
+        server = await websockets.serve(handler, "127.0.0.1", 0)
+        port = list(server.sockets)[0].getsockname()[1]
+        return server, f"http://127.0.0.1:{port}"
+
+    async def test_streams_all_fragments_then_eos(self):
+        received: list = []
+        closed = asyncio.Event()
+        server, base_url = await self._serve(received, closed)
+        try:
+            with mock.patch.dict(os.environ, {"ELEVENLABS_BASE_URL": base_url}):
+                tts = ElevenLabsWSTTS(ElevenLabsTTSConfig(api_key="fake", voice_id="fake-voice"))
+                await tts.open()
+                for frag in self.fragments:
+                    await tts.send_text(frag)
+                await tts.finish()
+
+                frames = [frame async for frame in tts.frames()]
+                await tts.abort()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual(sum(len(f) for f in frames), len(self.pcm) * len(self.fragments))
+        self.assertTrue(all(len(f) == tts.cfg.frame_bytes for f in frames[:-1]))
+        # every fragment space-terminated, then flush + EOS, nothing after EOS
+        texts = [m.get("text") for m in received[1:]]
+        self.assertEqual(texts[: len(self.fragments)], [f if f.endswith(" ") else f + " " for f in self.fragments])
+        self.assertEqual(received[-2], {"text": " ", "flush": True})
+        self.assertEqual(received[-1], {"text": ""})
+
+    async def test_abort_drops_socket_mid_stream(self):
+        received: list = []
+        closed = asyncio.Event()
+        server, base_url = await self._serve(received, closed)
+        try:
+            with mock.patch.dict(os.environ, {"ELEVENLABS_BASE_URL": base_url}):
+                tts = ElevenLabsWSTTS(ElevenLabsTTSConfig(api_key="fake", voice_id="fake-voice"))
+                await tts.open()
+                await tts.send_text(self.fragments[0])
+
+                frames = tts.frames()
+                first = await frames.__anext__()
+                await tts.abort()
+                await asyncio.wait_for(closed.wait(), timeout=5)
+                await frames.aclose()
+
+                # no-ops once aborted
+                await tts.send_text("more text")
+                await tts.finish()
+                await tts.abort()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual(len(first), tts.cfg.frame_bytes)
+        self.assertIsNone(tts._ws)
+        self.assertNotIn({"text": ""}, received)  # barge-in never sends EOS
+        self.assertNotIn("more text ", [m.get("text") for m in received])
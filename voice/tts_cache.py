@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from .audio_codecs import decode_opus_blob, encode_opus_blob
+
+
+@dataclass
+class TTSCacheStats:
+    hits_mem: int = 0
+    hits_disk: int = 0
+    misses: int = 0
+    singleflight_waits: int = 0
+    bytes_saved: int = 0
+    evictions: int = 0
+    bytes_used: int = 0
+    entries: int = 0
+
+
+def _norm_chunk_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip()
+
+
+class TTSAudioCache:
+    """
+    Content-addressed PCM cache for synthesized TTS chunks.
+
+    Key = sha256 over (voice_id, model_id, output format, voice settings payload,
+    normalized chunk text), so any change in voice/tuning naturally misses.
+
+    Tiers:
+      - in-memory LRU with a byte budget
+      - optional on-disk tier (one file per key) when disk_dir is set: the exact PCM the
+        provider returned, or opt-in Opus (`disk_codec="opus"`, ~1/7 of the size, lossy)
+    Concurrent requests for the same key are single-flighted: one upstream call,
+    everyone else waits for its bytes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        disk_dir: str = "",
+        max_entry_bytes: int = 2 * 1024 * 1024,
+        disk_codec: str = "pcm",
+        disk_bitrate: int = 48000,
+        sample_rate: int = 24000,
+    ):
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_entry_bytes = max(0, int(max_entry_bytes))
+        self.disk_dir = (disk_dir or "").strip()
+        self.disk_codec = "opus" if (disk_codec or "").strip().lower() == "opus" else "pcm"
+        self.disk_bitrate = int(disk_bitrate)
+        self.sample_rate = int(sample_rate)
+
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = TTSCacheStats()
+
+    @staticmethod
+    def make_key(
+        *,
+        voice_id: str,
+        model_id: str,
+        output_format: str,
+        voice_settings: dict,
+        text: str,
+        swap_endian: bool = False,
+    ) -> str:
+        blob = json.dumps(
+            {
+                "voice_id": voice_id or "",
+                "model_id": model_id or "",
+                "output_format": output_format or "",
+                "swap_endian": bool(swap_endian),
+                "voice_settings": voice_settings or {},
+                "text": _norm_chunk_text(text),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    # ---------------------------
+    # memory tier
+    # ---------------------------
+
+    def _mem_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pcm = self._mem.get(key)
+            if pcm is not None:
+                self._mem.move_to_end(key)
+            return pcm
+
+    def _mem_put(self, key: str, pcm: bytes):
+        if not pcm or len(pcm) > self.max_entry_bytes or len(pcm) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self.stats.bytes_used -= len(old)
+            self._mem[key] = pcm
+            self.stats.bytes_used += len(pcm)
+            while self.stats.bytes_used > self.max_bytes and self._mem:
+                _k, ev = self._mem.popitem(last=False)
+                self.stats.bytes_used -= len(ev)
+                self.stats.evictions += 1
+            self.stats.entries = len(self._mem)
+
+    # ---------------------------
+    # disk tier
+    # ---------------------------
+
+    def _disk_path(self, key: str) -> str:
+        ext = "opb" if self.disk_codec == "opus" else "pcm"
+        return os.path.join(self.disk_dir, key[:2], f"{key}.{ext}")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if self.disk_codec == "opus":
+            try:
+                return decode_opus_blob(data)
+            except Exception:
+                return None
+        return data
+
+    def _disk_put(self, key: str, pcm: bytes):
+        if not self.disk_dir or not pcm or len(pcm) > self.max_entry_bytes:
+            return
+        if self.disk_codec == "opus":
+            try:
+                data = encode_opus_blob(pcm, sample_rate=self.sample_rate, bitrate=self.disk_bitrate)
+            except Exception:
+                return
+        else:
+            data = pcm
+        path = self._disk_path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        pcm = self._mem_get(key)
+        if pcm is not None:
+            self.stats.hits_mem += 1
+            return pcm
+        if self.disk_dir:
+            pcm = await asyncio.to_thread(self._disk_get, key)
+            if pcm:
+                self.stats.hits_disk += 1
+                self._mem_put(key, pcm)
+                return pcm
+        return None
+
+    async def put(self, key: str, pcm: bytes):
+        self._mem_put(key, pcm)
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_put, key, pcm)
+
+    # ---------------------------
+    # streaming front-end
+    # ---------------------------
+
+    @staticmethod
+    def _frames(pcm: bytes, frame_bytes: int) -> AsyncIterator[memoryview]:
+        async def gen():
+            step = max(2, int(frame_bytes))
+            view = memoryview(pcm)  # cached PCM is immutable bytes: slice without copying
+            for i in range(0, len(pcm), step):
+                yield view[i : i + step]
+                await asyncio.sleep(0)
+
+        return gen()
+
+    async def stream(
+        self,
+        key: str,
+        synth: Callable[[Callable[[], None]], AsyncIterator[bytes | memoryview]],
+        *,
+        frame_bytes: int = 4096,
+    ) -> AsyncIterator[bytes | memoryview]:
+        """
+        Yield PCM for `key`: from cache on a hit, from a concurrent identical request
+        if one is in flight, otherwise from `synth(uncacheable)` (streamed live and recorded).
+        The provider calls `uncacheable()` when its output is not one clean rendition of the
+        text (e.g. it restarted on a fallback path after partial audio); nothing is stored then.
+        """
+        pcm = await self.get(key)
+        if pcm is not None:
+            self.stats.bytes_saved += len(pcm)
+            async for frame in self._frames(pcm, frame_bytes):
+                yield frame
+            return
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.stats.singleflight_waits += 1
+            try:
+                pcm = await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                pcm = None  # the leader was cancelled (barge-in); synthesize ourselves
+            except Exception:
+                pcm = None
+            if pcm:
+                self.stats.bytes_saved += len(pcm)
+                async for frame in self._frames(pcm, frame_bytes):
+                    yield frame
+                return
+
+        self.stats.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        buf = bytearray()
+        clean = True
+
+        def uncacheable():
+            nonlocal clean
+            clean = False
+
+        try:
+            async for frame in synth(uncacheable):
+                if clean:
+                    buf.extend(frame)
+                yield frame
+            pcm = bytes(buf) if clean else None
+            if pcm:
+                await self.put(key, pcm)
+            if not fut.done():
+                fut.set_result(pcm)  # None: waiters synthesize themselves
+        except BaseException as e:
+            if not fut.done():
+                if isinstance(e, Exception):
+                    fut.set_exception(e)
+                else:
+                    fut.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is fut:
+                self._inflight.pop(key, None)
+            # nobody awaited an exception -> don't warn "exception never retrieved"
+            if fut.done() and not fut.cancelled():
+                fut.exception()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return asdict(self.stats)
+
+
+_CACHE: Optional[TTSAudioCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_tts_cache() -> Optional[TTSAudioCache]:
+    """
+    Process-wide cache built from env (TTS_CACHE_ENABLED / TTS_CACHE_MAX_MB / TTS_CACHE_DIR /
+    TTS_CACHE_DISK_CODEC / TTS_CACHE_DISK_BITRATE).
+    Returns None when disabled.
+    """
+    global _CACHE
+    if os.getenv("TTS_CACHE_ENABLED", "1") != "1":
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                try:
+                    max_mb = float(os.getenv("TTS_CACHE_MAX_MB", "64"))
+                except Exception:
+                    max_mb = 64.0
+                _CACHE = TTSAudioCache(
+                    max_bytes=int(max_mb * 1024 * 1024),
+                    disk_dir=os.getenv("TTS_CACHE_DIR", ""),
+                    disk_codec=os.getenv("TTS_CACHE_DISK_CODEC", "pcm"),
+                    disk_bitrate=int(os.getenv("TTS_CACHE_DISK_BITRATE", "48000")),
+                )
+    return _CACHE
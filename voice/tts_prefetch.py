@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Callable, List, Optional, Set, Tuple
+
+_END = object()
+
+
+class TTSPrefetcher:
+    """
+    Bounded look-ahead synthesis for cadence chunks.
+
+    While the current chunk is being sent to the client, up to `depth` following
+    chunks are already synthesizing, so the HTTP round trip per chunk overlaps with
+    playback instead of showing up as silence between chunks. Chunks are always
+    yielded in their original order.
+
+    Usage:
+        prefetch = TTSPrefetcher(tts.stream_pcm, depth=2)
+        prefetch.start(chunks_q)
+        try:
+            async for chunk_text, pause_after, frames in prefetch:
+                async for pcm in frames:
+                    ...
+        finally:
+            await prefetch.aclose()
+    """
+
+    def __init__(self, synth: Callable[[str], AsyncIterator[bytes | memoryview]], *, depth: int = 2):
+        self.synth = synth
+        self.depth = max(0, int(depth))
+
+        # current chunk + `depth` chunks ahead may be synthesizing at once
+        self._slots = asyncio.Semaphore(self.depth + 1)
+        self._ordered: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._fills: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def start(self, chunks: asyncio.Queue):
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch(chunks))
+
+    async def _dispatch(self, chunks: asyncio.Queue):
+        try:
+            while True:
+                item = await chunks.get()
+                if item is None:
+                    break
+                chunk_text, pause_after = item
+                if not (chunk_text or "").strip():
+                    continue
+
+                await self._slots.acquire()
+                frames_q: asyncio.Queue = asyncio.Queue()
+                t = asyncio.create_task(self._fill(chunk_text, frames_q))
+                self._fills.add(t)
+                t.add_done_callback(self._fills.discard)
+                self._ordered.put_nowait((chunk_text, float(pause_after), frames_q))
+        finally:
+            self._ordered.put_nowait(None)
+
+    async def _fill(self, chunk_text: str, frames_q: asyncio.Queue):
+        try:
+            async for pcm in self.synth(chunk_text):
+                frames_q.put_nowait(pcm)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            frames_q.put_nowait(e)
+        finally:
+            frames_q.put_nowait(_END)
+
+    async def _drain(self, frames_q: asyncio.Queue) -> AsyncIterator[bytes | memoryview]:
+        try:
+            while True:
+                item = await frames_q.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._slots.release()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[str, float, AsyncIterator[bytes | memoryview]]:
+        if self._closed:
+            raise StopAsyncIteration
+        item = await self._ordered.get()
+        if item is None:
+            raise StopAsyncIteration
+        chunk_text, pause_after, frames_q = item
+        return chunk_text, pause_after, self._drain(frames_q)
+
+    async def aclose(self):
+        """
+        Cancel the dispatcher and every in-flight prefetch (barge-in / gen bump / done).
+        """
+        self._closed = True
+        tasks: List[asyncio.Task] = list(self._fills)
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._fills.clear()
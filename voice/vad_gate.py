@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, List, Optional, Tuple
+
+from .audio_dsp import pcm16_dbfs
+
+
+# 24 kHz PCM16 mono: bytes per millisecond
+_BYTES_PER_MS = 48
+
+
+@dataclass
+class VadGateStats:
+    frames_in: int = 0
+    frames_sent: int = 0
+    frames_suppressed: int = 0
+    ms_in: float = 0.0
+    ms_sent: float = 0.0
+    ms_suppressed: float = 0.0
+    keepalives: int = 0
+    segments: int = 0
+
+
+class VadGate:
+    """
+    Local energy VAD in front of the OpenAI uplink (24 kHz PCM16 frames of any size).
+
+    A frame is speech when its energy clears both an absolute floor (`min_dbfs`) and the
+    tracked noise floor by `margin_db`. Speech opens the gate and releases the buffered
+    `preroll_ms` first; the gate stays open for `hangover_ms` after the last speech frame
+    (must cover the server VAD's silence_duration_ms, or turns never end). While closed,
+    frames are dropped and `keepalive_ms` of audio time yields one short silence frame.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_dbfs: float = -50.0,
+        margin_db: float = 10.0,
+        hangover_ms: float = 900,
+        preroll_ms: float = 300,
+        keepalive_ms: float = 5000,
+        keepalive_frame_ms: float = 20,
+    ):
+        self.configure(
+            min_dbfs=min_dbfs,
+            margin_db=margin_db,
+            hangover_ms=hangover_ms,
+            preroll_ms=preroll_ms,
+            keepalive_ms=keepalive_ms,
+            keepalive_frame_ms=keepalive_frame_ms,
+        )
+
+        self.noise_floor_dbfs = -70.0
+        self.open = False
+        self._quiet_ms = 0.0
+        self._since_keepalive_ms = 0.0
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_bytes = 0
+        self.stats = VadGateStats()
+
+    def configure(
+        self,
+        *,
+        min_dbfs: Optional[float] = None,
+        margin_db: Optional[float] = None,
+        hangover_ms: Optional[float] = None,
+        preroll_ms: Optional[float] = None,
+        keepalive_ms: Optional[float] = None,
+        keepalive_frame_ms: Optional[float] = None,
+    ):
+        """Apply (re)configuration; None keeps the current value. Noise floor and stats are kept."""
+        if min_dbfs is not None:
+            self.min_dbfs = float(min_dbfs)
+        if margin_db is not None:
+            self.margin_db = float(margin_db)
+        if hangover_ms is not None:
+            self.hangover_ms = max(0, int(hangover_ms))
+        if preroll_ms is not None:
+            self.preroll_ms = max(0, int(preroll_ms))
+        if keepalive_ms is not None:
+            self.keepalive_ms = max(0, int(keepalive_ms))
+        if keepalive_frame_ms is not None:
+            self._keepalive_frame = b"\x00\x00" * (24 * max(10, int(keepalive_frame_ms)))
+
+    def _push_preroll(self, pcm: bytes):
+        self._preroll.append(pcm)
+        self._preroll_bytes += len(pcm)
+        cap = self.preroll_ms * _BYTES_PER_MS
+        while self._preroll and self._preroll_bytes - len(self._preroll[0]) >= cap:
+            self._preroll_bytes -= len(self._preroll.popleft())
+
+    def _drain_preroll(self) -> List[bytes]:
+        out = list(self._preroll)
+        n_ms = self._preroll_bytes / _BYTES_PER_MS
+        self.stats.frames_sent += len(out)
+        self.stats.frames_suppressed -= len(out)
+        self.stats.ms_sent += n_ms
+        self.stats.ms_suppressed -= n_ms
+        self._preroll.clear()
+        self._preroll_bytes = 0
+        return out
+
+    def process(self, pcm: bytes) -> Tuple[List[bytes], bool]:
+        """
+        Returns (frames to forward upstream, segment_ended). segment_ended is True on the
+        frame that closes the gate (hangover expired).
+        """
+        frame_ms = len(pcm) / _BYTES_PER_MS
+        db = pcm16_dbfs(pcm)
+        speech = db >= max(self.min_dbfs, self.noise_floor_dbfs + self.margin_db)
+
+        # noise floor: falls fast, rises slowly (slower still while "speech", so steady
+        # background noise above min_dbfs is eventually learned instead of holding the gate open)
+        a = 0.3 if db < self.noise_floor_dbfs else (0.005 if speech else 0.02)
+        a = 1.0 - (1.0 - a) ** (frame_ms / 20.0)  # per-20ms constants, any frame size
+        self.noise_floor_dbfs = max(-100.0, (1.0 - a) * self.noise_floor_dbfs + a * db)
+
+        st = self.stats
+        st.frames_in += 1
+        st.ms_in += frame_ms
+
+        if speech:
+            self._quiet_ms = 0.0
+            out: List[bytes] = []
+            if not self.open:
+                self.open = True
+                st.segments += 1
+                out = self._drain_preroll()
+            out.append(pcm)
+            st.frames_sent += 1
+            st.ms_sent += frame_ms
+            return out, False
+
+        if self.open:
+            self._quiet_ms += frame_ms
+            if self._quiet_ms <= self.hangover_ms:
+                st.frames_sent += 1
+                st.ms_sent += frame_ms
+                return [pcm], False
+            self.open = False
+            self._since_keepalive_ms = 0.0
+            ended = True
+        else:
+            ended = False
+
+        st.frames_suppressed += 1
+        st.ms_suppressed += frame_ms
+        self._push_preroll(pcm)
+
+        if self.keepalive_ms:
+            self._since_keepalive_ms += frame_ms
+            if self._since_keepalive_ms >= self.keepalive_ms:
+                self._since_keepalive_ms = 0.0
+                st.keepalives += 1
+                return [self._keepalive_frame], ended
+        return [], ended
+
+    def reset(self):
+        self.open = False
+        self._quiet_ms = 0.0
+        self._since_keepalive_ms = 0.0
+        self._preroll.clear()
+        self._preroll_bytes = 0
+
+    def snapshot(self) -> dict:
+        out = asdict(self.stats)
+        out["suppressed_pct"] = round(100.0 * self.stats.ms_suppressed / max(1e-9, self.stats.ms_in), 1)
+        out["noise_floor_dbfs"] = round(self.noise_floor_dbfs, 1)
+        for k in ("ms_in", "ms_sent", "ms_suppressed"):
+            out[k] = round(out[k], 1)
+        return out
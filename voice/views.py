@@ -13,9 +13,6 @@ from .models import LovedOne
 from .rag_factory import get_rag
 
 
-_rag = get_rag()
-
-
 def _lo_queryset_for_profile(profile_id: str, request=None):
     """
     New models.py uses LovedOne.user (FK) instead of profile_id.
@@ -210,7 +207,7 @@ def add_memory(request):
 
     memory_id = uuid.uuid4().hex
 
-    indexed_ids = _rag.add_memory(
+    indexed_ids = get_rag().add_memory(
         profile_id=profile_key,
         loved_one_id=int(lo.id),
         text=text,